@@ -96,6 +96,15 @@ let multipartClipboard = {
     inProgress: false
 };
 const CLIPBOARD_CHUNK_SIZE = 750 * 1024;
+// Mirrors CLIPBOARD_BINARY_MIME_IDS on the server.
+const CLIPBOARD_BINARY_MIME_TYPES = {
+    1: 'image/png',
+    2: 'image/jpeg',
+    3: 'application/pdf',
+    4: 'image/gif',
+    5: 'image/webp',
+    6: 'image/bmp'
+};
 
 
 let detectedSharedModeType = null;
@@ -584,6 +593,8 @@ function getCurrentSettingsPayload() {
     settingsToSend['use_paint_over_quality'] = getBoolParam('use_paint_over_quality', true);
     settingsToSend['scaling_dpi'] = getIntParam('scaling_dpi', 96);
     settingsToSend['enable_binary_clipboard'] = getBoolParam('enable_binary_clipboard', false);
+    // Only a client that handles binary clipboard data can receive 0x10 frames.
+    settingsToSend['binary_clipboard_frames'] = settingsToSend['enable_binary_clipboard'];
     if (window.is_manual_resolution_mode && manual_width != null && manual_height != null) {
         settingsToSend['is_manual_resolution_mode'] = true;
         settingsToSend['manual_width'] = roundDownToEven(manual_width * dpr);
@@ -2905,6 +2916,48 @@ function handleDecodedFrame(frame) {
         }
 
 
+      } else if (dataTypeByte === 0x10) {
+        const CLIPBOARD_BINARY_HEADER_LENGTH = 6;
+        if (arrayBuffer.byteLength < CLIPBOARD_BINARY_HEADER_LENGTH) return;
+        if (!enable_binary_clipboard) {
+          console.warn("Received binary clipboard frame from server, but feature is disabled on client. Ignoring.");
+          return;
+        }
+        const mimeType = CLIPBOARD_BINARY_MIME_TYPES[dataView.getUint8(1)];
+        const totalSize = dataView.getUint32(2, true);
+        if (!mimeType) {
+          console.error(`Unknown binary clipboard mime id ${dataView.getUint8(1)}.`);
+          return;
+        }
+        if (!multipartClipboard.inProgress || multipartClipboard.mimeType !== mimeType || multipartClipboard.totalSize !== totalSize) {
+          multipartClipboard.mimeType = mimeType;
+          multipartClipboard.totalSize = totalSize;
+          multipartClipboard.receivedSize = 0;
+          multipartClipboard.data = [];
+          multipartClipboard.inProgress = true;
+        }
+        const chunk = new Uint8Array(arrayBuffer, CLIPBOARD_BINARY_HEADER_LENGTH);
+        multipartClipboard.data.push(chunk);
+        multipartClipboard.receivedSize += chunk.byteLength;
+        if (multipartClipboard.receivedSize >= multipartClipboard.totalSize) {
+          multipartClipboard.inProgress = false;
+          if (multipartClipboard.receivedSize !== multipartClipboard.totalSize) {
+            console.error('Binary clipboard size mismatch. Aborting.');
+            multipartClipboard.data = [];
+            return;
+          }
+          const blob = new Blob(multipartClipboard.data, { type: mimeType });
+          multipartClipboard.data = [];
+          const clipboardItem = new ClipboardItem({ [mimeType]: blob });
+          navigator.clipboard.write([clipboardItem]).then(() => {
+            console.log(`Successfully wrote image (${mimeType}) from server to local clipboard.`);
+            const uiText = `Image (${mimeType}) received from session and copied to clipboard.`;
+            window.postMessage({ type: 'clipboardContentUpdate', text: uiText }, window.location.origin);
+          }).catch(err => {
+            console.error('Failed to write image to clipboard:', err);
+          });
+        }
+
       } else if (dataTypeByte === 0x03) {
         const jpegHeaderLength = isSharedMode ? 4 : 6;
         if (arrayBuffer.byteLength < jpegHeaderLength) return;
@@ -1521,7 +1521,7 @@ class WebRTCInput:
                 try:
                     char_to_type = chr(unicode_codepoint)
                     if not char_to_type.isalpha():
-                        logger_webrtc_input.debug(f"Handling non-alpha '{char_to_type}' with atomic 'type' to prevent stuck modifiers.")
+                        logger_webrtc_input.debug("Handling non-alpha '%s' with atomic 'type' to prevent stuck modifiers.", char_to_type)
                         await self.on_message(f"co,end,{char_to_type}")
                         self.atomically_typed_keys.add(keysym)
                     else:
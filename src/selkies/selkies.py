@@ -11,9 +11,46 @@ FRAME_ID_SUSPICIOUS_GAP_THRESHOLD = (
     MAX_UINT16_FRAME_ID // 2
 )
 STALLED_CLIENT_TIMEOUT_SECONDS = 4.0
-RTT_SMOOTHING_SAMPLES = 20
+RTT_SMOOTHING_ALPHA = 0.15
 SENT_FRAME_TIMESTAMP_HISTORY_SIZE = 1000
 TARGET_FRAMERATE = 60
+MAX_CAPTURE_DISPLAYS = 2
+WS_WRITE_LIMIT_HIGH = 1024 * 1024
+WS_WRITE_LIMIT_LOW = 256 * 1024
+CLIENT_SEND_QUEUE_SIZE = 64
+AUDIO_PACKET_HEADER = b"\x01\x00"
+JPEG_PACKET_HEADER = b"\x03\x00"
+JPEG_PACKET_HEADER_LEN = len(JPEG_PACKET_HEADER)
+AUDIO_PACKET_HEADER_LEN = len(AUDIO_PACKET_HEADER)
+AUDIO_QUEUE_COALESCE_THRESHOLD = 10
+AUDIO_QUEUE_MAXSIZE = 32
+AUDIO_BUFFER_SIZE = 4096
+AUDIO_BUFFER_POOL_SIZE = 8
+AUDIO_BYTES_FLUSH_PACKETS = 16
+# Client mic audio is written to PulseAudio in blocks of this many bytes
+# (40 ms of 24 kHz s16 mono); a partial block is flushed after the timeout.
+MIC_FLUSH_BYTES = 1920
+MIC_FLUSH_TIMEOUT_S = 0.05
+MIC_WRITE_QUEUE_SIZE = 8
+CAPTURE_RESTART_DEBOUNCE_S = 0.05
+STRIPE_DROP_KEYFRAME_INTERVAL_S = 1.0
+# Leading text of every client text message handled by the data server itself;
+# anything else is an input event for the input handler.
+SERVER_TEXT_MESSAGE_PREFIXES = (
+    "CLIENT_FRAME_ACK", "FILE_UPLOAD_", "SETTINGS,", "START_", "STOP_",
+    "SET_NATIVE_CURSOR_RENDERING,", "r,", "s,", "cmd,",
+)
+CLIPBOARD_DATA_HEADER = b"clipboard_data,"
+# Binary clipboard frames: <opcode:u8><mime id:u8><total size:u32 LE> + raw bytes.
+CLIPBOARD_BINARY_OPCODE = 0x10
+CLIPBOARD_BINARY_MIME_IDS = {
+    "image/png": 1,
+    "image/jpeg": 2,
+    "application/pdf": 3,
+    "image/gif": 4,
+    "image/webp": 5,
+    "image/bmp": 6,
+}
 
 UINPUT_MOUSE_SOCKET = ""
 JS_SOCKET_PATH = "/tmp"
@@ -40,26 +77,52 @@ data_logger = logging.getLogger("data_websocket")
 
 X11_CAPTURE_AVAILABLE = False
 PCMFLUX_AVAILABLE = False
+UVLOOP_AVAILABLE = False
 
 import asyncio
 import argparse
-import base64
 import ctypes
 import json
 import os
 import pathlib
 import re
+import socket
 import struct
 from asyncio import subprocess
 import sys
+import threading
 import time
 import websockets
 import websockets.asyncio.server as ws_async
 from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from shutil import which
 from signal import SIGINT, signal
-from .settings import settings, SETTING_DEFINITIONS
+from .settings import settings, SETTING_DEFINITIONS, SETTING_DEFINITIONS_BY_NAME
+
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+try:
+    import orjson
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode('utf-8')
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 try:
     from pcmflux import AudioCapture, AudioCaptureSettings, AudioChunkCallback
@@ -105,11 +168,148 @@ except OSError as e:
     logger.error(f"Could not create upload directory {upload_dir_path}: {e}")
     upload_dir_path = None
 
+# Resolved once; upload paths are checked against it on every FILE_UPLOAD_START.
+upload_dir_real_path = os.path.abspath(os.path.realpath(upload_dir_path)) if upload_dir_path else None
+FILE_UPLOAD_START_PATTERN = re.compile(r"FILE_UPLOAD_START:(?P<path>[^:]+):(?P<size>\d+)\Z")
+CLIPBOARD_BINARY_HEADER = struct.Struct("<BBI")
+
 
 class SelkiesAppError(Exception):
     pass
 
 
+@lru_cache(maxsize=None)
+def _which(name):
+    """Cached shutil.which; $PATH lookups stat every entry and the answer rarely changes."""
+    return which(name)
+
+
+def refresh_bin_cache():
+    """Forgets cached executable lookups, e.g. after $PATH or installed packages change."""
+    _which.cache_clear()
+
+
+def _set_tcp_nodelay(websocket):
+    """Disables Nagle's algorithm on a client connection so small frames are sent immediately."""
+    sock = websocket.transport.get_extra_info('socket')
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError as e:
+        data_logger.debug(f"Could not set TCP_NODELAY on {websocket.remote_address}: {e}")
+
+
+def _put_nowait_or_drop(queue, item):
+    """Queues an item from a call_soon_threadsafe callback, dropping it if the queue is full."""
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        pass
+
+
+def _is_path_within(path, directory):
+    """True if the absolute path is directory itself or below it."""
+    return path == directory or path.startswith(directory + os.sep)
+
+
+def _write_all(fd, data):
+    """Writes all of data to a raw file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+class FrameTimestampRing:
+    """
+    Send timestamps for recent frame IDs, in a fixed ring indexed by frame ID.
+    Newer frames overwrite older slots, so there is no eviction step, and
+    lookups only hit when the slot still holds the requested frame.
+    """
+
+    __slots__ = ("_mask", "_frame_ids", "_timestamps")
+
+    def __init__(self, min_size):
+        # A power-of-two size divides the uint16 frame ID space evenly, so the
+        # ring stays contiguous across frame ID wraparound.
+        size = 1 << max(0, min_size - 1).bit_length()
+        self._mask = size - 1
+        self._frame_ids = [None] * size
+        self._timestamps = [0.0] * size
+
+    def record(self, frame_id, timestamp):
+        slot = frame_id & self._mask
+        self._frame_ids[slot] = frame_id
+        self._timestamps[slot] = timestamp
+
+    def pop(self, frame_id):
+        """Returns and forgets the send time of frame_id, or None if it is not held."""
+        slot = frame_id & self._mask
+        if self._frame_ids[slot] != frame_id:
+            return None
+        self._frame_ids[slot] = None
+        return self._timestamps[slot]
+
+    def clear(self):
+        self._frame_ids = [None] * len(self._frame_ids)
+
+
+class ByteRingBuffer:
+    """
+    Fixed-capacity byte FIFO over one preallocated bytearray. Writes that do
+    not fit overwrite the oldest bytes instead of shifting the buffer.
+    """
+
+    __slots__ = ("_view", "_capacity", "_head", "_count")
+
+    def __init__(self, capacity):
+        self._view = memoryview(bytearray(capacity))
+        self._capacity = capacity
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def write(self, data):
+        """Appends data and returns how many old bytes were overwritten."""
+        capacity = self._capacity
+        size = len(data)
+        dropped = max(0, self._count + size - capacity)
+        if size >= capacity:
+            self._view[:] = data[size - capacity:]
+            self._head = 0
+            self._count = capacity
+            return dropped
+        if dropped:
+            self._head = (self._head + dropped) % capacity
+            self._count -= dropped
+        tail = (self._head + self._count) % capacity
+        first = min(size, capacity - tail)
+        self._view[tail:tail + first] = data[:first]
+        if first < size:
+            self._view[:size - first] = data[first:]
+        self._count += size
+        return dropped
+
+    def read(self, size):
+        """Removes and returns up to size of the oldest bytes."""
+        size = min(size, self._count)
+        head = self._head
+        end = head + size
+        if end <= self._capacity:
+            data = self._view[head:end].tobytes()
+        else:
+            data = self._view[head:].tobytes() + self._view[:end - self._capacity].tobytes()
+        self._head = end % self._capacity
+        self._count -= size
+        return data
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+
 class SelkiesStreamingApp:
     def __init__(
         self,
@@ -131,6 +331,7 @@ class SelkiesStreamingApp:
         self.encoder = encoder
         self.framerate = framerate
         self.last_cursor_sent = None
+        self.last_cursor_message = None
         self.data_streaming_server = data_streaming_server
 
     async def send_ws_clipboard_data(self, data, mime_type="text/plain"):
@@ -150,32 +351,54 @@ class SelkiesStreamingApp:
             data_bytes = data.encode('utf-8') if not is_binary and isinstance(data, str) else data
             total_size = len(data_bytes)
             from .input_handler import CLIPBOARD_CHUNK_SIZE
+            # Clients that opted into binary clipboard frames get the raw bytes;
+            # everyone else keeps the base64 text protocol.
+            text_clients = None
+            mime_id = CLIPBOARD_BINARY_MIME_IDS.get(mime_type) if is_binary else None
+            if mime_id is not None:
+                binary_clients = self.data_streaming_server.binary_clipboard_frame_clients & self.data_streaming_server.clients
+                if binary_clients:
+                    header = CLIPBOARD_BINARY_HEADER.pack(CLIPBOARD_BINARY_OPCODE, mime_id, total_size)
+                    data_view = memoryview(data_bytes)
+                    for offset in range(0, total_size, CLIPBOARD_CHUNK_SIZE):
+                        await self.data_streaming_server.send_bulk_to_clients(
+                            header + data_view[offset:offset + CLIPBOARD_CHUNK_SIZE], binary_clients
+                        )
+                    text_clients = self.data_streaming_server.clients - binary_clients
+                    if not text_clients:
+                        return
             if total_size < CLIPBOARD_CHUNK_SIZE:
-                encoded_data = base64.b64encode(data_bytes).decode('ascii')
+                encoded_data = b64encode(data_bytes).decode('ascii')
                 if is_binary:
                     message = f"clipboard_binary,{mime_type},{encoded_data}"
                 else:
                     message = f"clipboard,{encoded_data}"
-                websockets.broadcast(self.data_streaming_server.clients, message)
+                self.data_streaming_server.broadcast_to_clients(message, text_clients)
             else:
                 data_logger.info(f"Sending large clipboard data ({mime_type}, {total_size} bytes) via multipart.")
                 start_message = f"clipboard_start,{mime_type},{total_size}"
-                websockets.broadcast(self.data_streaming_server.clients, start_message)
-                offset = 0
-                while offset < total_size:
-                    chunk = data_bytes[offset:offset + CLIPBOARD_CHUNK_SIZE]
-                    encoded_chunk = base64.b64encode(chunk).decode('ascii')
-                    data_message = f"clipboard_data,{encoded_chunk}"
-                    websockets.broadcast(self.data_streaming_server.clients, data_message)
-                    offset += len(chunk)
-                    await asyncio.sleep(0)
-                websockets.broadcast(self.data_streaming_server.clients, "clipboard_finish")
+                await self.data_streaming_server.send_bulk_to_clients(start_message, text_clients)
+                # Encode the whole payload in one pass, then slice on 4-char
+                # boundaries so every chunk still decodes on its own client-side.
+                # Chunks stay bytes and are sent as text frames, so there is no
+                # per-chunk decode to str.
+                encoded_view = memoryview(b64encode(data_bytes))
+                encoded_chunk_size = (CLIPBOARD_CHUNK_SIZE // 3) * 4
+                for offset in range(0, len(encoded_view), encoded_chunk_size):
+                    data_message = CLIPBOARD_DATA_HEADER + encoded_view[offset:offset + encoded_chunk_size]
+                    # Waits for queue space, so chunks are produced no faster
+                    # than the per-client relays send them.
+                    await self.data_streaming_server.send_bulk_to_clients(data_message, text_clients, text=True)
+                await self.data_streaming_server.send_bulk_to_clients("clipboard_finish", text_clients)
                 data_logger.info("Finished sending multi-part clipboard data.")
         except Exception as e:
             data_logger.error(f"Failed to send clipboard data: {e}", exc_info=True)
 
     def send_ws_cursor_data(self, data):
+        if data == self.last_cursor_sent:
+            return
         self.last_cursor_sent = data
+        self.last_cursor_message = f"cursor,{json_dumps(data)}"
         if (
             self.data_streaming_server
             and hasattr(self.data_streaming_server, "clients")
@@ -184,15 +407,8 @@ class SelkiesStreamingApp:
             and self.async_event_loop.is_running()
         ):
 
-            msg_str = json.dumps(data)
-            msg_to_broadcast = f"cursor,{msg_str}"
-            clients_ref = self.data_streaming_server.clients
-
-            async def _broadcast_cursor_helper():
-                websockets.broadcast(clients_ref, msg_to_broadcast)
-
-            asyncio.run_coroutine_threadsafe(
-                _broadcast_cursor_helper(), self.async_event_loop
+            self.async_event_loop.call_soon_threadsafe(
+                self.data_streaming_server.broadcast_to_clients, self.last_cursor_message
             )
         else:
             data_logger.warning("Cannot broadcast cursor data: no clients connected or server not ready.")
@@ -213,51 +429,84 @@ class SelkiesStreamingApp:
         )
 
 
+@lru_cache(maxsize=256)
 def fit_res(w, h, max_w, max_h):
     if w <= max_w and h <= max_h:
         return w, h
-    aspect = w / h
+    # Scale against the original aspect ratio with exact integer math.
+    orig_w, orig_h = w, h
     if w > max_w:
         w = max_w
-        h = int(w / aspect)
+        h = (w * orig_h) // orig_w
     if h > max_h:
         h = max_h
-        w = int(h * aspect)
+        w = (h * orig_w) // orig_h
     return w - (w % 2), h - (h % 2)
 
 
+# One pass over the whole xrandr output: each line start is either a connected
+# output header, the "current WxH" screen summary, or an available mode.
+XRANDR_LINE_PAT = re.compile(
+    r"^(?:(?P<screen>\S+) connected"
+    r"|.*current (?P<current>\d+\s*x\s*\d+)"
+    r"|[ \t]*(?P<res>\d+x\d+)\s+\d+\.\d+)",
+    re.MULTILINE,
+)
+XRANDR_MODELINE_PAT = re.compile(r'Modeline\s+"([^"]+)"\s+(.*)')
+XRANDR_OUTPUT_CACHE_TTL_S = 0.5
+
+_xrandr_output_cache = None
+_modeline_cache = {}
+
+
+def _invalidate_xrandr_cache():
+    """Drops the cached xrandr query output after the screen configuration changes."""
+    global _xrandr_output_cache
+    _xrandr_output_cache = None
+
+
+async def _query_xrandr():
+    """
+    Returns the output of a plain `xrandr` query, reusing the previous result
+    if it is younger than XRANDR_OUTPUT_CACHE_TTL_S.
+    """
+    global _xrandr_output_cache
+    now = time.monotonic()
+    if _xrandr_output_cache and now - _xrandr_output_cache[0] < XRANDR_OUTPUT_CACHE_TTL_S:
+        return _xrandr_output_cache[1]
+    process = await subprocess.create_subprocess_exec(
+        "xrandr",
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT
+    )
+    stdout, _ = await process.communicate()
+    xrandr_output = stdout.decode('utf-8')
+    _xrandr_output_cache = (now, xrandr_output)
+    return xrandr_output
+
+
 async def get_new_res(res_str):
     screen_name = None
     resolutions = []
-    screen_pat = re.compile(r"(\S+) connected")
-    current_pat = re.compile(r".*current (\d+\s*x\s*\d+).*")
-    res_pat = re.compile(r"^(\d+x\d+)\s+\d+\.\d+.*")
     curr_res = new_res = max_res_str = res_str
     try:
-        process = await subprocess.create_subprocess_exec(
-            "xrandr",
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT
-        )
-        stdout, _ = await process.communicate()
-        xrandr_output = stdout.decode('utf-8')
+        xrandr_output = await _query_xrandr()
     except (FileNotFoundError, Exception) as e:
         logger_gst_app_resize.error(f"xrandr command failed: {e}")
         return curr_res, new_res, resolutions, max_res_str, screen_name
     current_screen_modes_started = False
-    for line in xrandr_output.splitlines():
-        screen_match = screen_pat.match(line)
-        if screen_match:
+    for line_match in XRANDR_LINE_PAT.finditer(xrandr_output):
+        kind = line_match.lastgroup
+        if kind == "screen":
             if screen_name is None:
-                screen_name = screen_match.group(1)
-            current_screen_modes_started = screen_name == screen_match.group(1)
-        if current_screen_modes_started:
-            current_match = current_pat.match(line)
-            if current_match:
-                curr_res = current_match.group(1).replace(" ", "")
-            res_match = res_pat.match(line.strip())
-            if res_match:
-                resolutions.append(res_match.group(1))
+                screen_name = line_match.group("screen")
+            current_screen_modes_started = screen_name == line_match.group("screen")
+        elif not current_screen_modes_started:
+            continue
+        elif kind == "current":
+            curr_res = line_match.group("current").replace(" ", "")
+        else:
+            resolutions.append(line_match.group("res"))
     if not screen_name:
         logger_gst_app_resize.warning(
             "Could not determine connected screen from xrandr."
@@ -290,6 +539,11 @@ async def resize_display(res_str):  # e.g., res_str is "2560x1280"
         return False
 
     target_mode_to_set = res_str
+    # Mode registration and activation are batched into a single xrandr
+    # invocation; xrandr applies the operations in order. --newmode runs on
+    # its own first, so the failure cleanup only removes a mode this call created.
+    cmd = ["xrandr"]
+    mode_added = False
 
     if res_str not in available_resolutions:
         logger_gst_app_resize.info(
@@ -305,7 +559,6 @@ async def resize_display(res_str):  # e.g., res_str is "2560x1280"
                 f"Failed to generate modeline for {res_str}: {e}"
             )
             return False
-
         cmd_new = ["xrandr", "--newmode", res_str] + modeline_params.split()
         new_mode_proc = await subprocess.create_subprocess_exec(
             *cmd_new,
@@ -313,24 +566,31 @@ async def resize_display(res_str):  # e.g., res_str is "2560x1280"
             stderr=subprocess.PIPE
         )
         stdout_new, stderr_new = await new_mode_proc.communicate()
+        _invalidate_xrandr_cache()
         if new_mode_proc.returncode != 0:
             logger_gst_app_resize.error(
                 f"Failed to create new xrandr mode with '{' '.join(cmd_new)}': {stderr_new.decode()}"
             )
             return False
-        logger_gst_app_resize.info(f"Successfully ran: {' '.join(cmd_new)}")
+        mode_added = True
+        cmd += ["--addmode", screen_name, res_str]
 
-        cmd_add = ["xrandr", "--addmode", screen_name, res_str]
-        add_mode_proc = await subprocess.create_subprocess_exec(
-            *cmd_add,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+    logger_gst_app_resize.info(
+        f"Applying xrandr mode '{target_mode_to_set}' for screen '{screen_name}'."
+    )
+    cmd += ["--output", screen_name, "--mode", target_mode_to_set]
+    set_mode_proc = await subprocess.create_subprocess_exec(
+        *cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    stdout_set, stderr_set = await set_mode_proc.communicate()
+    _invalidate_xrandr_cache()
+    if set_mode_proc.returncode != 0:
+        logger_gst_app_resize.error(
+            f"Failed to set mode '{target_mode_to_set}' on screen '{screen_name}' with '{' '.join(cmd)}': {stderr_set.decode()}"
         )
-        stdout_add, stderr_add = await add_mode_proc.communicate()
-        if add_mode_proc.returncode != 0:
-            logger_gst_app_resize.error(
-                f"Failed to add mode '{res_str}' to screen '{screen_name}': {stderr_add.decode()}"
-            )
+        if mode_added:
             # Cleanup commands
             delmode_proc = await subprocess.create_subprocess_exec(
                 "xrandr", "--delmode", screen_name, res_str,
@@ -338,30 +598,14 @@ async def resize_display(res_str):  # e.g., res_str is "2560x1280"
                 stderr=subprocess.PIPE
             )
             await delmode_proc.communicate()
-            
+
             rmmode_proc = await subprocess.create_subprocess_exec(
                 "xrandr", "--rmmode", res_str,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE
             )
-            await rmmmode_proc.communicate()
-            return False
-        logger_gst_app_resize.info(f"Successfully ran: {' '.join(cmd_add)}")
-
-    logger_gst_app_resize.info(
-        f"Applying xrandr mode '{target_mode_to_set}' for screen '{screen_name}'."
-    )
-    cmd_output = ["xrandr", "--output", screen_name, "--mode", target_mode_to_set]
-    set_mode_proc = await subprocess.create_subprocess_exec(
-        *cmd_output,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
-    stdout_set, stderr_set = await set_mode_proc.communicate()
-    if set_mode_proc.returncode != 0:
-        logger_gst_app_resize.error(
-            f"Failed to set mode '{target_mode_to_set}' on screen '{screen_name}': {stderr_set.decode()}"
-        )
+            await rmmode_proc.communicate()
+            _invalidate_xrandr_cache()
         return False
 
     logger_gst_app_resize.info(
@@ -372,6 +616,9 @@ async def resize_display(res_str):  # e.g., res_str is "2560x1280"
 
 async def generate_xrandr_gtf_modeline(res_wh_str):
     """Generates an xrandr modeline string using cvt or gtf."""
+    cached_modeline = _modeline_cache.get(res_wh_str)
+    if cached_modeline:
+        return cached_modeline
     try:
         w_str, h_str = res_wh_str.split("x")
         cmd = ["cvt", w_str, h_str, "60"]
@@ -409,12 +656,15 @@ async def generate_xrandr_gtf_modeline(res_wh_str):
         raise Exception(
             f"Invalid resolution format for modeline generation: {res_wh_str}"
         )
-    match = re.search(r'Modeline\s+"([^"]+)"\s+(.*)', modeline_output)
+    match = XRANDR_MODELINE_PAT.search(modeline_output)
     if not match:
         raise Exception(
             f"Could not parse modeline from {tool_name} output: {modeline_output}"
         )
-    return match.group(1).strip(), match.group(2)
+    _modeline_cache[res_wh_str] = (match.group(1).strip(), match.group(2))
+    return _modeline_cache[res_wh_str]
+
+DRI_RENDER_NODE_PAT = re.compile(r"^/dev/dri/renderD(\d+)$")
 
 def parse_dri_node_to_index(node_path: str) -> int:
     """
@@ -422,89 +672,95 @@ def parse_dri_node_to_index(node_path: str) -> int:
     Returns -1 if the path is invalid, malformed, or empty, which
     disables VA-API usage in the capture module.
     """
-    if not node_path or not node_path.startswith('/dev/dri/renderD'):
-        if node_path:
-             logger.warning(f"Invalid DRI node format: '{node_path}'. Expected '/dev/dri/renderD...'. VA-API will be disabled.")
+    if not node_path:
         return -1
-    try:
-        num_str = node_path.split('renderD')[-1]
-        render_num = int(num_str)
-        index = render_num - 128
-        if index < 0:
-            logger.warning(f"Parsed DRI node number {render_num} from '{node_path}' is less than 128. Invalid.")
-            return -1
-        logger.info(f"Parsed DRI node '{node_path}' to index {index}.")
-        return index
-    except (ValueError, IndexError) as e:
-        logger.warning(f"Could not parse DRI node path '{node_path}': {e}. VA-API will be disabled.")
+    node_match = DRI_RENDER_NODE_PAT.match(node_path)
+    if not node_match:
+        logger.warning(f"Invalid DRI node format: '{node_path}'. Expected '/dev/dri/renderD<number>'. VA-API will be disabled.")
         return -1
+    render_num = int(node_match.group(1))
+    index = render_num - 128
+    if index < 0:
+        logger.warning(f"Parsed DRI node number {render_num} from '{node_path}' is less than 128. Invalid.")
+        return -1
+    logger.info(f"Parsed DRI node '{node_path}' to index {index}.")
+    return index
+
+async def _reload_xsettingsd(logger):
+    """Sends SIGHUP to a running xsettingsd so it rereads ~/.xsettingsd."""
+    if not _which("pgrep") or not _which("kill"):
+        logger.debug("pgrep or kill not found. Skipping xsettingsd reload.")
+        return
+    pgrep_proc = await subprocess.create_subprocess_exec(
+        "pgrep", "xsettingsd",
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    pgrep_stdout, _ = await pgrep_proc.communicate()
+
+    if pgrep_proc.returncode == 0:
+        pid_output = pgrep_stdout.decode().strip()
+        if pid_output:
+            pid = pid_output.splitlines()[0]
+            logger.info(f"Found xsettingsd process with PID: {pid}.")
+            kill_proc = await subprocess.create_subprocess_exec(
+                "kill", "-1", pid,
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+            _, kill_stderr = await kill_proc.communicate()
+            if kill_proc.returncode == 0:
+                logger.info(f"Sent SIGHUP to xsettingsd process {pid} to reload config.")
+            else:
+                logger.warning(f"Failed to send SIGHUP to xsettingsd process {pid}. Error: {kill_stderr.decode().strip()}")
+    else:
+        logger.info("xsettingsd process not found. Skipping reload.")
+
+def _write_dpi_config_files(xresources_path, xsettingsd_config_path, dpi_value):
+    """Writes the Xresources and xsettingsd DPI configs. Blocking; run in an executor."""
+    with open(xresources_path, "w") as f:
+        f.write(f"Xft.dpi:   {dpi_value}\n")
+
+    xsettings_dpi = dpi_value * 1024
+    config_content = (
+        "Xft/Antialias 1\n"
+        "Xft/Hinting 1\n"
+        "Xft/HintStyle \"hintfull\"\n"
+        "Xft/RGBA \"rgb\"\n"
+        f"Xft/DPI {xsettings_dpi}\n"
+    )
+    with open(xsettingsd_config_path, "w") as f:
+        f.write(config_content)
 
 async def _run_xrdb(dpi_value, logger):
     """Helper function to apply DPI via xrdb and xsettingsd."""
-    if not which("xrdb"):
+    if not _which("xrdb"):
         logger.debug("xrdb not found. Skipping Xresources DPI setting.")
         return False
         
     xresources_path_str = os.path.expanduser("~/.Xresources")
+    xsettingsd_config_path = os.path.expanduser("~/.xsettingsd")
     try:    
-        with open(xresources_path_str, "w") as f:
-            f.write(f"Xft.dpi:   {dpi_value}\n")
+        await asyncio.get_running_loop().run_in_executor(
+            None, _write_dpi_config_files, xresources_path_str, xsettingsd_config_path, dpi_value
+        )
         logger.info(f"Wrote 'Xft.dpi:   {dpi_value}' to {xresources_path_str}.")
+        logger.info(f"Wrote font and DPI settings to {xsettingsd_config_path}.")
 
+        # Loading Xresources and reloading xsettingsd are independent; overlap them.
         cmd_xrdb = ["xrdb", xresources_path_str]
         process = await subprocess.create_subprocess_exec(
             *cmd_xrdb,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE
         )
-        stdout, stderr = await process.communicate()
+        (stdout, stderr), _ = await asyncio.gather(
+            process.communicate(), _reload_xsettingsd(logger)
+        )
         
         xrdb_success = process.returncode == 0
         if xrdb_success:
             logger.info(f"Successfully loaded {xresources_path_str} using xrdb.")
         else:
             logger.warning(f"Failed to load {xresources_path_str} using xrdb. RC: {process.returncode}, Error: {stderr.decode().strip()}")
-
-        xsettingsd_config_path = os.path.expanduser("~/.xsettingsd")
-        xsettings_dpi = dpi_value * 1024
-        
-        config_content = (
-            "Xft/Antialias 1\n"
-            "Xft/Hinting 1\n"
-            "Xft/HintStyle \"hintfull\"\n"
-            "Xft/RGBA \"rgb\"\n"
-            f"Xft/DPI {xsettings_dpi}\n"
-        )
-        
-        with open(xsettingsd_config_path, "w") as f:
-            f.write(config_content)
-        logger.info(f"Wrote font and DPI settings to {xsettingsd_config_path}.")
-
-        if not which("pgrep") or not which("kill"):
-            logger.debug("pgrep or kill not found. Skipping xsettingsd reload.")
-        else:
-            pgrep_proc = await subprocess.create_subprocess_exec(
-                "pgrep", "xsettingsd",
-                stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-            pgrep_stdout, _ = await pgrep_proc.communicate()
-
-            if pgrep_proc.returncode == 0:
-                pid_output = pgrep_stdout.decode().strip()
-                if pid_output:
-                    pid = pid_output.splitlines()[0]
-                    logger.info(f"Found xsettingsd process with PID: {pid}.")
-                    kill_proc = await subprocess.create_subprocess_exec(
-                        "kill", "-1", pid,
-                        stdout=subprocess.PIPE, stderr=subprocess.PIPE
-                    )
-                    _, kill_stderr = await kill_proc.communicate()
-                    if kill_proc.returncode == 0:
-                        logger.info(f"Sent SIGHUP to xsettingsd process {pid} to reload config.")
-                    else:
-                        logger.warning(f"Failed to send SIGHUP to xsettingsd process {pid}. Error: {kill_stderr.decode().strip()}")
-            else:
-                logger.info("xsettingsd process not found. Skipping reload.")
         
         return xrdb_success
 
@@ -536,14 +792,14 @@ async def _get_xfce_session_env(logger):
             logger.debug(f"Could not read environment for PID {pid}. Path {env_path} does not exist.")
             return None
 
-        with open(env_path, "r") as f:
+        with open(env_path, "rb") as f:
             environ_data = f.read()
         
-        env = {}
-        for line in environ_data.split('\x00'):
-            if '=' in line:
-                key, value = line.split('=', 1)
-                env[key] = value
+        env = {
+            os.fsdecode(key): os.fsdecode(value)
+            for key, sep, value in (entry.partition(b'=') for entry in environ_data.split(b'\x00'))
+            if sep
+        }
         
         if "DBUS_SESSION_BUS_ADDRESS" not in env:
             logger.debug(f"Found xfce4-session (PID {pid}), but DBUS_SESSION_BUS_ADDRESS was not in its environment.")
@@ -557,7 +813,7 @@ async def _get_xfce_session_env(logger):
 
 async def _run_xfconf(dpi_value, logger):
     """Helper function to apply DPI via xfconf-query for XFCE."""
-    if not which("xfconf-query"):
+    if not _which("xfconf-query"):
         logger.debug("xfconf-query not found. Skipping XFCE DPI setting via xfconf-query.")
         return False
 
@@ -614,74 +870,67 @@ async def _run_xfconf(dpi_value, logger):
 
 async def _run_mate_gsettings(dpi_value, logger):
     """Helper function to apply DPI via gsettings for MATE."""
-    if not which("gsettings"):
+    if not _which("gsettings"):
         logger.debug("gsettings not found. Skipping MATE gsettings.")
         return False
 
-    mate_settings_succeeded_at_least_once = False
-
-    # MATE: org.mate.interface window-scaling-factor
-    try:
-        target_mate_scale_float = float(dpi_value) / 96.0
-        # For fractional scales (e.g., 1.5), MATE's integer window-scaling-factor
-        # should be 1. We rely on font DPI / text scaling for the fractional part.
-        # If it's an integer scale (e.g., 2.0 for 192 DPI), then use that integer.
-        if target_mate_scale_float == int(target_mate_scale_float):
-            mate_window_scaling_factor = int(target_mate_scale_float)
-        else:
-            mate_window_scaling_factor = 1 
-        
-        mate_window_scaling_factor = max(1, mate_window_scaling_factor) # Ensure it's at least 1
-
-        cmd_gsettings_mate_window_scale = [
-            "gsettings", "set",
-            "org.mate.interface", "window-scaling-factor",
-            str(mate_window_scaling_factor)
-        ]
-        result_mate_window_scale = await subprocess.create_subprocess_exec(
-            *cmd_gsettings_mate_window_scale,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        stdout_mate_window, stderr_mate_window = await result_mate_window_scale.communicate()
-        if result_mate_window_scale.returncode == 0:
-            logger.info(f"Successfully set MATE window-scaling-factor to {mate_window_scaling_factor} (for DPI {dpi_value}) using gsettings.")
-            mate_settings_succeeded_at_least_once = True
-        else:
-            stderr_text = stderr_mate_window.decode().strip()
+    async def run_gsettings(cmd, setting_desc, success_msg):
+        try:
+            process = await subprocess.create_subprocess_exec(
+                *cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            _stdout, stderr = await process.communicate()
+            if process.returncode == 0:
+                logger.info(success_msg)
+                return True
+            stderr_text = stderr.decode().strip()
             if "No such schema" in stderr_text or "No such key" in stderr_text:
-                logger.debug(f"gsettings: Schema/key 'org.mate.interface window-scaling-factor' not found. Error: {stderr_text}")
+                logger.debug(f"gsettings: Schema/key '{setting_desc}' not found. Error: {stderr_text}")
             else:
-                logger.warning(f"Failed to set MATE window-scaling-factor using gsettings. RC: {result_mate_window_scale.returncode}, Error: {stderr_text}")
-    except Exception as e:
-        logger.error(f"Error running gsettings for MATE window-scaling-factor: {e}")
+                logger.warning(f"Failed to set {setting_desc} using gsettings. RC: {process.returncode}, Error: {stderr_text}")
+        except Exception as e:
+            logger.error(f"Error running gsettings for {setting_desc}: {e}")
+        return False
 
-    # MATE: org.mate.font-rendering dpi
-    try:
-        cmd_gsettings_mate_font_dpi = [
-            "gsettings", "set",
-            "org.mate.font-rendering", "dpi",
-            str(dpi_value) # MATE font rendering takes the direct DPI value
-        ]
-        result_mate_font_dpi = await subprocess.create_subprocess_exec(
-            *cmd_gsettings_mate_font_dpi,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        stdout_mate_font, stderr_mate_font = await result_mate_font_dpi.communicate()
-        if result_mate_font_dpi.returncode == 0:
-            logger.info(f"Successfully set MATE font-rendering DPI to {dpi_value} using gsettings.")
-            mate_settings_succeeded_at_least_once = True
-        else:
-            stderr_font_text = stderr_mate_font.decode().strip()
-            if "No such schema" in stderr_font_text or "No such key" in stderr_font_text:
-                logger.debug(f"gsettings: Schema/key 'org.mate.font-rendering dpi' not found. Error: {stderr_font_text}")
-            else:
-                logger.warning(f"Failed to set MATE font-rendering DPI using gsettings. RC: {result_mate_font_dpi.returncode}, Error: {stderr_font_text}")
-    except Exception as e:
-        logger.error(f"Error running gsettings for MATE font-rendering DPI: {e}")
+    # MATE: org.mate.interface window-scaling-factor
+    target_mate_scale_float = float(dpi_value) / 96.0
+    # For fractional scales (e.g., 1.5), MATE's integer window-scaling-factor
+    # should be 1. We rely on font DPI / text scaling for the fractional part.
+    # If it's an integer scale (e.g., 2.0 for 192 DPI), then use that integer.
+    if target_mate_scale_float == int(target_mate_scale_float):
+        mate_window_scaling_factor = int(target_mate_scale_float)
+    else:
+        mate_window_scaling_factor = 1 
     
-    return mate_settings_succeeded_at_least_once
+    mate_window_scaling_factor = max(1, mate_window_scaling_factor) # Ensure it's at least 1
+
+    cmd_gsettings_mate_window_scale = [
+        "gsettings", "set",
+        "org.mate.interface", "window-scaling-factor",
+        str(mate_window_scaling_factor)
+    ]
+    # MATE: org.mate.font-rendering dpi
+    cmd_gsettings_mate_font_dpi = [
+        "gsettings", "set",
+        "org.mate.font-rendering", "dpi",
+        str(dpi_value) # MATE font rendering takes the direct DPI value
+    ]
+    # The two keys are independent, so both gsettings calls run concurrently.
+    results = await asyncio.gather(
+        run_gsettings(
+            cmd_gsettings_mate_window_scale,
+            "org.mate.interface window-scaling-factor",
+            f"Successfully set MATE window-scaling-factor to {mate_window_scaling_factor} (for DPI {dpi_value}) using gsettings."
+        ),
+        run_gsettings(
+            cmd_gsettings_mate_font_dpi,
+            "org.mate.font-rendering dpi",
+            f"Successfully set MATE font-rendering DPI to {dpi_value} using gsettings."
+        ),
+    )
+    return any(results)
 
 
 async def set_dpi(dpi_setting):
@@ -702,35 +951,37 @@ async def set_dpi(dpi_setting):
     de_name_for_log = "Unknown" # For logging which DE path was taken
 
     # DE Detection and Action Order: KDE -> XFCE -> MATE -> i3 -> Openbox
-    if which("startplasma-x11"):
+    if _which("startplasma-x11"):
         de_name_for_log = "KDE"
         logger_gst_app_resize.info(f"{de_name_for_log} detected. Applying xrdb for DPI {dpi_value}.")
         if await _run_xrdb(dpi_value, logger_gst_app_resize):
             any_method_succeeded = True
     
-    elif which("xfce4-session"):
+    elif _which("xfce4-session"):
         de_name_for_log = "XFCE"
         logger_gst_app_resize.info(f"{de_name_for_log} detected. Applying xfconf-query for DPI {dpi_value}.")
         if await _run_xfconf(dpi_value, logger_gst_app_resize):
             any_method_succeeded = True
         # For XFCE, only xfconf-query is used to avoid potential double scaling.
 
-    elif which("mate-session"):
+    elif _which("mate-session"):
         de_name_for_log = "MATE"
         logger_gst_app_resize.info(f"{de_name_for_log} detected. Applying MATE gsettings and xrdb for DPI {dpi_value}.")
-        mate_gsettings_success = await _run_mate_gsettings(dpi_value, logger_gst_app_resize)
         # Also apply xrdb for MATE for wider application compatibility / fallback
-        xrdb_for_mate_success = await _run_xrdb(dpi_value, logger_gst_app_resize)
+        mate_gsettings_success, xrdb_for_mate_success = await asyncio.gather(
+            _run_mate_gsettings(dpi_value, logger_gst_app_resize),
+            _run_xrdb(dpi_value, logger_gst_app_resize),
+        )
         if mate_gsettings_success or xrdb_for_mate_success:
             any_method_succeeded = True
 
-    elif which("i3"):
+    elif _which("i3"):
         de_name_for_log = "i3"
         logger_gst_app_resize.info(f"{de_name_for_log} detected. Applying xrdb for DPI {dpi_value}.")
         if await _run_xrdb(dpi_value, logger_gst_app_resize):
             any_method_succeeded = True
             
-    elif which("openbox-session") or which("openbox"): # Check for openbox binary as well
+    elif _which("openbox-session") or _which("openbox"): # Check for openbox binary as well
         de_name_for_log = "Openbox"
         logger_gst_app_resize.info(f"{de_name_for_log} detected. Applying xrdb for DPI {dpi_value}.")
         if await _run_xrdb(dpi_value, logger_gst_app_resize):
@@ -751,7 +1002,8 @@ async def set_cursor_size(size):
     if not isinstance(size, int) or size <= 0:
         logger_gst_app_resize.error(f"Invalid cursor size: {size}")
         return False
-    if which("xfconf-query"):
+
+    async def set_xfce_cursor_size():
         cmd = [
             "xfconf-query",
             "-c",
@@ -771,9 +1023,12 @@ async def set_cursor_size(size):
         )
         await process.communicate()
         if process.returncode == 0:
+            logger_gst_app_resize.info(f"Set XFCE cursor size to {size}")
             return True
         logger_gst_app_resize.warning("Failed to set XFCE cursor size.")
-    if which("gsettings"):
+        return False
+
+    async def set_gnome_cursor_size():
         try:
             cmd_set = [
                 "gsettings",
@@ -796,10 +1051,65 @@ async def set_cursor_size(size):
             logger_gst_app_resize.warning(
                 f"Error trying to set GNOME cursor size via gsettings: {e}"
             )
+        return False
+
+    # Both tools are independent, so run whichever are installed concurrently.
+    setters = []
+    if _which("xfconf-query"):
+        setters.append(set_xfce_cursor_size())
+    if _which("gsettings"):
+        setters.append(set_gnome_cursor_size())
+    if setters:
+        results = await asyncio.gather(*setters, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger_gst_app_resize.warning(f"Error while setting cursor size: {result}")
+        if any(result is True for result in results):
+            return True
     logger_gst_app_resize.warning("No supported tool found/worked to set cursor size.")
     return False
 
 
+# Per-display client settings that are baked into a running capture; a change
+# to any of them requires the capture to be updated or restarted.
+CAPTURE_VIDEO_SETTINGS = (
+    'encoder', 'framerate', 'h264_crf', 'h264_fullcolor', 'h264_streaming_mode',
+    'jpeg_quality', 'paint_over_jpeg_quality', 'use_paint_over_quality',
+    'h264_paintover_crf', 'h264_paintover_burst_frames', 'use_cpu',
+)
+
+
+def _settings_bool(value):
+    return str(value).lower() == "true"
+
+
+# Client SETTINGS payload keys and the converter applied to each non-null value.
+SETTINGS_PAYLOAD_SCHEMA = (
+    ("framerate", int),
+    ("h264_crf", int),
+    ("encoder", str),
+    ("h264_fullcolor", _settings_bool),
+    ("h264_streaming_mode", _settings_bool),
+    ("is_manual_resolution_mode", _settings_bool),
+    ("manual_width", int),
+    ("manual_height", int),
+    ("audio_bitrate", int),
+    ("initialClientWidth", int),
+    ("initialClientHeight", int),
+    ("jpeg_quality", int),
+    ("paint_over_jpeg_quality", int),
+    ("use_cpu", _settings_bool),
+    ("h264_paintover_crf", int),
+    ("h264_paintover_burst_frames", int),
+    ("use_paint_over_quality", _settings_bool),
+    ("scaling_dpi", int),
+    ("enable_binary_clipboard", _settings_bool),
+    ("binary_clipboard_frames", _settings_bool),
+    ("displayId", str),
+    ("displayPosition", str),
+)
+
+
 class DataStreamingServer:
     """Handles the data WebSocket connection for input, stats, and control messages."""
 
@@ -825,6 +1135,12 @@ class DataStreamingServer:
             None
         )
         self.clients = set()
+        # Cached result of _get_primary_viewers(); reset to None whenever
+        # self.clients or a display's websocket changes.
+        self._primary_viewers = None
+        self.client_send_queues = {}
+        self._client_close_tasks = set()
+        self.binary_clipboard_frame_clients = set()
         self.app = app
         self.cli_args = cli_args
         self.RECONNECT_DEBOUNCE_MS = 500
@@ -837,15 +1153,17 @@ class DataStreamingServer:
         self._last_client_acknowledged_frame_id_update_time = 0.0
         self._previous_ack_id_for_stall_check = -1
         self._previous_sent_id_for_stall_check = -1
-        self._sent_frame_timestamps = OrderedDict()
-        self._rtt_samples = deque(maxlen=RTT_SMOOTHING_SAMPLES)
         self._smoothed_rtt_ms = 0.0
+        self._stream_resolution_message = (None, None, None)
+        self._capture_settings_template = None
+        self._server_settings_message = None
+        self._watermark_path_bytes = None
         self._sent_frames_log = deque()
         
         def get_initial_value(setting_name):
             """Helper to get the correct initial integer/bool from a processed setting."""
             processed_value = getattr(self.cli_args, setting_name)
-            setting_def = next((s for s in SETTING_DEFINITIONS if s['name'] == setting_name), None)
+            setting_def = SETTING_DEFINITIONS_BY_NAME.get(setting_name)
             if not setting_def: return None
 
             if setting_def['type'] == 'range':
@@ -877,8 +1195,9 @@ class DataStreamingServer:
 
         self._system_monitor_task_ws = None
         self._gpu_monitor_task_ws = None
-        self._stats_sender_task_ws = None
+        self._network_monitor_task_ws = None
         self._shared_stats_ws = {}
+        self._has_gpu = False
         self.uinput_mouse_socket = uinput_mouse_socket
         self.js_socket_path = js_socket_path
         self.enable_clipboard = enable_clipboard
@@ -891,6 +1210,8 @@ class DataStreamingServer:
         self._last_adjustment_timestamp = 0.0
         self.client_settings_received = None
         self._reconfigure_lock = asyncio.Lock()
+        self._pending_capture_restarts = {}
+        self._capture_restarts_in_progress = {}
         self._is_reconfiguring = False
         self._bytes_sent_in_interval = 0
         self._last_bandwidth_calc_time = time.monotonic()
@@ -905,6 +1226,15 @@ class DataStreamingServer:
         self.display_clients = {}
         self.video_chunk_queues = {}
         self.capture_instances = {}
+        # Dedicated pool for blocking pixelflux start/stop calls so they never
+        # queue behind unrelated work on the loop's default executor.
+        self._capture_executor = ThreadPoolExecutor(
+            max_workers=MAX_CAPTURE_DISPLAYS, thread_name_prefix="selkies-capture"
+        )
+        # Blocking PulseAudio mic writes run on one thread, so each stream is
+        # only ever written and closed from the same thread, in order.
+        self._mic_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="selkies-mic")
+        self._upload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="selkies-upload")
 
         # pcmflux audio capture state
         self.audio_device_name = audio_device_name
@@ -915,12 +1245,95 @@ class DataStreamingServer:
         self.pcmflux_audio_queue = None
         self.pcmflux_send_task = None
         self.pcmflux_capture_loop = None
+        self.pcmflux_audio_packets_dropped = 0
+        self._audio_buffer_pool = deque()
+        for _ in range(AUDIO_BUFFER_POOL_SIZE):
+            pooled_buf = bytearray(AUDIO_BUFFER_SIZE)
+            pooled_buf[:AUDIO_PACKET_HEADER_LEN] = AUDIO_PACKET_HEADER
+            self._audio_buffer_pool.append(pooled_buf)
 
         # State for window manager swapping
         self._last_display_count = 0
         self._is_wm_swapped = False
         self._wm_swap_is_supported = None
 
+    def _get_primary_viewers(self):
+        """
+        Returns the clients that should receive primary display video and
+        audio: every client except those driving a secondary display.
+        """
+        if self._primary_viewers is None:
+            secondary_websockets = {
+                client_info.get('ws')
+                for did, client_info in self.display_clients.items()
+                if did != 'primary' and client_info.get('ws')
+            }
+            self._primary_viewers = frozenset(self.clients - secondary_websockets)
+        return self._primary_viewers
+
+    def broadcast_to_clients(self, message, clients=None, text=None):
+        """
+        Queues a message for every connected client, or only for ``clients``
+        when given. Each client has its own bounded queue drained by a relay
+        task, so one slow client cannot hold up the others; a client whose
+        queue overflows is disconnected. ``text=True`` sends a bytes message
+        as a text frame (it must be valid UTF-8).
+        """
+        for websocket, queue in list(self.client_send_queues.items()):
+            if clients is not None and websocket not in clients:
+                continue
+            try:
+                queue.put_nowait((message, text))
+            except asyncio.QueueFull:
+                data_logger.warning(
+                    f"Send queue full for client {websocket.remote_address}. Disconnecting slow client."
+                )
+                self._disconnect_slow_client(websocket)
+
+    async def send_bulk_to_clients(self, message, clients=None, text=None):
+        """
+        Like broadcast_to_clients, but waits for queue space instead of
+        treating a full queue as overflow, so multi-chunk transfers are paced
+        by the per-client relays. A client whose queue stays full for
+        STALLED_CLIENT_TIMEOUT_SECONDS is disconnected.
+        """
+        targets = [
+            (websocket, queue) for websocket, queue in self.client_send_queues.items()
+            if clients is None or websocket in clients
+        ]
+        if targets:
+            await asyncio.gather(*(
+                self._put_or_disconnect(websocket, queue, (message, text))
+                for websocket, queue in targets
+            ))
+
+    async def _put_or_disconnect(self, websocket, queue, item):
+        try:
+            await asyncio.wait_for(queue.put(item), STALLED_CLIENT_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            if self.client_send_queues.get(websocket) is queue:
+                data_logger.warning(
+                    f"Send queue for client {websocket.remote_address} stalled. Disconnecting slow client."
+                )
+                self._disconnect_slow_client(websocket)
+
+    def _disconnect_slow_client(self, websocket):
+        self.client_send_queues.pop(websocket, None)
+        close_task = asyncio.create_task(websocket.close(code=1013, reason="Client too slow"))
+        self._client_close_tasks.add(close_task)
+        close_task.add_done_callback(self._client_close_tasks.discard)
+
+    async def _client_send_relay(self, websocket, queue):
+        """Sends queued broadcast messages to a single client, in order."""
+        try:
+            while True:
+                message, text = await queue.get()
+                await websocket.send(message, text=text)
+        except websockets.ConnectionClosed:
+            pass
+        except asyncio.CancelledError:
+            pass
+
     async def broadcast_display_config(self):
         """Broadcasts the current display configuration to all clients."""
         if not self.clients:
@@ -931,54 +1344,130 @@ class DataStreamingServer:
             "type": "display_config_update",
             "displays": connected_displays
         }
-        message_str = f"DISPLAY_CONFIG_UPDATE,{json.dumps(payload)}"
+        message_str = f"DISPLAY_CONFIG_UPDATE,{json_dumps(payload)}"
         
         data_logger.info(f"Broadcasting display config update: {message_str}")
         websockets.broadcast(self.clients, message_str)
 
-    def _pcmflux_audio_callback(self, result_ptr, user_data):
+    def _make_pcmflux_audio_callback(self, audio_queue, capture_loop):
         """
-        C-style callback passed to pcmflux, called from its capture thread.
+        Builds the C-style callback passed to pcmflux, called from its capture thread.
+        The queue, loop and helpers it needs are bound as closure locals so the
+        per-packet path does no attribute lookups on self.
         """
-        if self.is_pcmflux_capturing and result_ptr and self.pcmflux_audio_queue is not None:
+        acquire_buffer = self._acquire_audio_buffer
+        put_packet = self._put_audio_packet_drop_oldest
+        call_soon_threadsafe = capture_loop.call_soon_threadsafe
+        loop_is_closed = capture_loop.is_closed
+        memmove = ctypes.memmove
+        c_char = ctypes.c_char
+        header_len = AUDIO_PACKET_HEADER_LEN
+
+        def pcmflux_audio_callback(result_ptr, user_data):
+            if not (self.is_pcmflux_capturing and result_ptr):
+                return
             result = result_ptr.contents
-            if result.data and result.size > 0:
-                data_bytes = bytes(ctypes.cast(
-                    result.data, ctypes.POINTER(ctypes.c_ubyte * result.size)
-                ).contents)
-
-                if self.pcmflux_capture_loop and not self.pcmflux_capture_loop.is_closed():
-                    asyncio.run_coroutine_threadsafe(
-                        self.pcmflux_audio_queue.put(data_bytes), self.pcmflux_capture_loop)
+            size = result.size
+            if result.data and size > 0:
+                # Copy the Opus payload straight in behind the protocol header of
+                # a pooled buffer so the sender can broadcast it as-is.
+                packet_len = header_len + size
+                packet_buf = acquire_buffer(packet_len)
+                memmove((c_char * size).from_buffer(packet_buf, header_len), result.data, size)
+                if not loop_is_closed():
+                    call_soon_threadsafe(put_packet, audio_queue, (packet_buf, packet_len))
+
+        return pcmflux_audio_callback
+
+    def _acquire_audio_buffer(self, packet_len):
+        """
+        Takes a header-prefilled buffer from the audio pool, falling back to a
+        fresh allocation when the pool is empty or the packet is oversized.
+        """
+        if packet_len <= AUDIO_BUFFER_SIZE:
+            try:
+                return self._audio_buffer_pool.pop()
+            except IndexError:
+                pass
+        packet_buf = bytearray(max(packet_len, AUDIO_BUFFER_SIZE))
+        packet_buf[:AUDIO_PACKET_HEADER_LEN] = AUDIO_PACKET_HEADER
+        return packet_buf
+
+    def _release_audio_buffer(self, packet_buf):
+        """Returns a buffer to the audio pool once nothing references it."""
+        if len(packet_buf) == AUDIO_BUFFER_SIZE and len(self._audio_buffer_pool) < AUDIO_BUFFER_POOL_SIZE:
+            self._audio_buffer_pool.append(packet_buf)
+
+    def _put_audio_packet_drop_oldest(self, queue, packet):
+        """Queues an audio packet, evicting the oldest one if the queue is full."""
+        try:
+            queue.put_nowait(packet)
+        except asyncio.QueueFull:
+            try:
+                evicted_buf, _ = queue.get_nowait()
+                queue.task_done()
+                self._release_audio_buffer(evicted_buf)
+                self.pcmflux_audio_packets_dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+            queue.put_nowait(packet)
     
     async def _pcmflux_send_audio_chunks(self):
         """
         Async task to broadcast Opus audio chunks from the queue to WebSocket clients.
         """
         data_logger.info("pcmflux audio chunk broadcasting task started.")
+        # Sent-byte accounting is batched locally and folded into the shared
+        # counter every AUDIO_BYTES_FLUSH_PACKETS packets.
+        bytes_sent = 0
+        packets_since_flush = 0
         try:
             while True:
-                opus_bytes = await self.pcmflux_audio_queue.get()
+                packet_buf, packet_len = await self.pcmflux_audio_queue.get()
 
-                secondary_websockets = {
-                    client_info.get('ws')
-                    for did, client_info in self.display_clients.items()
-                    if did != 'primary' and client_info.get('ws')
-                }
-                primary_viewers = self.clients - secondary_websockets
+                # When the sender has fallen behind, skip straight to the newest
+                # packet rather than replaying a backlog of stale audio.
+                if self.pcmflux_audio_queue.qsize() > AUDIO_QUEUE_COALESCE_THRESHOLD:
+                    dropped = 0
+                    while True:
+                        try:
+                            newer_packet = self.pcmflux_audio_queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            break
+                        self.pcmflux_audio_queue.task_done()
+                        self._release_audio_buffer(packet_buf)
+                        packet_buf, packet_len = newer_packet
+                        dropped += 1
+                    self.pcmflux_audio_packets_dropped += dropped
+                    data_logger.debug(
+                        "Audio sender behind; dropped %d stale packets (%d total).",
+                        dropped, self.pcmflux_audio_packets_dropped,
+                    )
+
+                primary_viewers = self._get_primary_viewers()
 
                 if not primary_viewers:
+                    self._release_audio_buffer(packet_buf)
                     self.pcmflux_audio_queue.task_done()
                     continue
                 
-                message_to_send = b'\x01\x00' + opus_bytes
-                self._bytes_sent_in_interval += len(message_to_send) * len(primary_viewers)
-                websockets.broadcast(primary_viewers, message_to_send)
+                bytes_sent += packet_len * len(primary_viewers)
+                packets_since_flush += 1
+                if packets_since_flush >= AUDIO_BYTES_FLUSH_PACKETS:
+                    self._bytes_sent_in_interval += bytes_sent
+                    bytes_sent = 0
+                    packets_since_flush = 0
+                # broadcast() frames and writes synchronously, so the buffer can
+                # go straight back to the pool afterwards.
+                with memoryview(packet_buf) as packet_view:
+                    websockets.broadcast(primary_viewers, packet_view[:packet_len])
+                self._release_audio_buffer(packet_buf)
 
                 self.pcmflux_audio_queue.task_done()
         except asyncio.CancelledError:
             data_logger.info("pcmflux audio chunk broadcasting task cancelled.")
         finally:
+            self._bytes_sent_in_interval += bytes_sent
             data_logger.info("pcmflux audio chunk broadcasting task finished.")
 
     async def _start_pcmflux_pipeline(self):
@@ -1017,9 +1506,11 @@ class DataStreamingServer:
             data_logger.info(f"pcmflux settings: device='{self.audio_device_name}', "
                              f"bitrate={capture_settings.opus_bitrate}, channels={capture_settings.channels}")
 
-            self.pcmflux_callback = AudioChunkCallback(self._pcmflux_audio_callback)
+            self.pcmflux_audio_queue = asyncio.Queue(maxsize=AUDIO_QUEUE_MAXSIZE)
+            self.pcmflux_callback = AudioChunkCallback(
+                self._make_pcmflux_audio_callback(self.pcmflux_audio_queue, self.pcmflux_capture_loop)
+            )
             self.pcmflux_module = AudioCapture()
-            self.pcmflux_audio_queue = asyncio.Queue()
 
             await self.pcmflux_capture_loop.run_in_executor(
                 None, self.pcmflux_module.start_capture, self.pcmflux_settings, self.pcmflux_callback
@@ -1052,16 +1543,19 @@ class DataStreamingServer:
             self.pcmflux_send_task = None
         
         if self.pcmflux_module:
+            pcmflux_module = self.pcmflux_module
+            self.pcmflux_module = None
             try:
                 if self.pcmflux_capture_loop:
-                    await self.pcmflux_capture_loop.run_in_executor(
-                        None, self.pcmflux_module.stop_capture
+                    # Only the executor work item keeps the module alive from here,
+                    # so its C destructor runs on the worker thread, not the loop.
+                    stop_future = self.pcmflux_capture_loop.run_in_executor(
+                        None, pcmflux_module.stop_capture
                     )
+                    del pcmflux_module
+                    await stop_future
             except Exception as e:
                 data_logger.error(f"Error during pcmflux stop_capture: {e}")
-            finally:
-                del self.pcmflux_module
-                self.pcmflux_module = None
         
         self.pcmflux_audio_queue = None
         data_logger.info("pcmflux audio pipeline stopped.")
@@ -1170,8 +1664,13 @@ class DataStreamingServer:
                 await self.client_settings_received.wait()
             data_logger.info(f"Client settings received, proceeding with backpressure loop for '{display_id}'.")
 
+            # Frame budgets derived from client_fps, recomputed only when it changes.
+            cached_client_fps = None
+            frames_per_ms = 0.0
+            allowed_desync_frames = 0.0
             while True:
                 await asyncio.sleep(self.backpressure_check_interval_s)
+                now = time.monotonic()
 
                 display_state = self.display_clients.get(display_id)
                 if not display_state:
@@ -1191,7 +1690,7 @@ class DataStreamingServer:
                     if not display_state.get('backpressure_enabled', True):
                          data_logger.info(f"Backpressure LIFTED for '{display_id}' (client ACK is -1).")
                     display_state['backpressure_enabled'] = True
-                    display_state['last_ack_update_time'] = time.monotonic()
+                    display_state['last_ack_update_time'] = now
                     continue
 
                 client_fps = display_state.get('latest_client_fps', 0.0)
@@ -1202,18 +1701,21 @@ class DataStreamingServer:
 
                 if abs(server_id - client_id) > FRAME_ID_SUSPICIOUS_GAP_THRESHOLD:
                     display_state['backpressure_enabled'] = True
-                    display_state['last_ack_update_time'] = time.monotonic()
+                    display_state['last_ack_update_time'] = now
                     continue
                 
                 if server_id == 0: continue
 
                 frame_desync = (server_id - client_id) if server_id >= client_id else ((MAX_UINT16_FRAME_ID - client_id) + server_id + 1)
-                allowed_desync_frames = (self.allowed_desync_ms / 1000.0) * client_fps
+                if client_fps != cached_client_fps:
+                    cached_client_fps = client_fps
+                    frames_per_ms = client_fps / 1000.0
+                    allowed_desync_frames = self.allowed_desync_ms * frames_per_ms
                 current_rtt_ms = display_state.get('smoothed_rtt', 0.0)
-                latency_adjustment_frames = (current_rtt_ms / 1000.0) * client_fps if current_rtt_ms > self.latency_threshold_for_adjustment_ms else 0
+                latency_adjustment_frames = current_rtt_ms * frames_per_ms if current_rtt_ms > self.latency_threshold_for_adjustment_ms else 0
                 effective_desync_frames = frame_desync - latency_adjustment_frames
 
-                time_since_last_ack = time.monotonic() - display_state.get('last_ack_update_time', time.monotonic())
+                time_since_last_ack = now - display_state.get('last_ack_update_time', now)
                 
                 if time_since_last_ack > STALLED_CLIENT_TIMEOUT_SECONDS:
                     if display_state.get('backpressure_enabled', True):
@@ -1248,64 +1750,55 @@ class DataStreamingServer:
         height = primary_client.get('height', 0)
 
         if width > 0 and height > 0 and self.clients:
-            message = {
-                "type": "stream_resolution",
-                "width": width,
-                "height": height,
-            }
-            message_str = json.dumps(message)
+            cached_width, cached_height, message_str = self._stream_resolution_message
+            if (cached_width, cached_height) != (width, height):
+                message = {
+                    "type": "stream_resolution",
+                    "width": width,
+                    "height": height,
+                }
+                message_str = json_dumps(message)
+                self._stream_resolution_message = (width, height, message_str)
             data_logger.info(f"Broadcasting primary stream resolution to all clients: {message_str}")
             websockets.broadcast(self.clients, message_str)
 
+    def _get_server_settings_message(self):
+        """
+        Serializes the server_settings message once; it only depends on the
+        server configuration, which does not change after startup.
+        """
+        if self._server_settings_message is not None:
+            return self._server_settings_message
+        server_settings_payload = {"type": "server_settings", "settings": {}}
+        for setting_def in SETTING_DEFINITIONS:
+            name = setting_def['name']
+            if name in ['port', 'dri_node', 'debug', 'audio_device_name', 'watermark_path']:
+                continue
+            value = getattr(settings, name)
+            if setting_def['type'] == 'bool':
+                bool_val, is_locked = value
+                payload_entry = {'value': bool_val, 'locked': is_locked}
+            else:
+                payload_entry = {'value': value}
+
+            if setting_def['type'] == 'range':
+                payload_entry['min'], payload_entry['max'] = value
+                if 'meta' in setting_def and 'default_value' in setting_def['meta']:
+                    payload_entry['default'] = setting_def['meta']['default_value']
+            elif setting_def['type'] in ['enum', 'list']:
+                if 'meta' in setting_def and 'allowed' in setting_def['meta']:
+                    payload_entry['allowed'] = setting_def['meta']['allowed']
+            server_settings_payload["settings"][name] = payload_entry
+        self._server_settings_message = json_dumps(server_settings_payload)
+        return self._server_settings_message
+
     def _parse_settings_payload(self, payload_str: str) -> dict:
-        settings_data = json.loads(payload_str)
-        parsed = {}
-
-        def get_int(k):
-            v = settings_data.get(k)
-            return int(v) if v is not None else None
-
-        def get_bool(k):
-            v = settings_data.get(k)
-            return str(v).lower() == "true" if v is not None else None
-
-        def get_str(k):
-            v = settings_data.get(k)
-            return str(v) if v is not None else None
-        parsed["framerate"] = get_int("framerate")
-        parsed["h264_crf"] = get_int("h264_crf")
-        parsed["encoder"] = get_str("encoder")
-        parsed["h264_fullcolor"] = get_bool("h264_fullcolor")
-        parsed["h264_streaming_mode"] = get_bool("h264_streaming_mode")
-        parsed["is_manual_resolution_mode"] = get_bool(
-            "is_manual_resolution_mode"
-        )
-        parsed["manual_width"] = get_int(
-            "manual_width"
-        )
-        parsed["manual_height"] = get_int(
-            "manual_height"
-        )
-        parsed["audio_bitrate"] = get_int("audio_bitrate")
-        parsed["initialClientWidth"] = get_int(
-            "initialClientWidth"
-        )
-        parsed["initialClientHeight"] = get_int(
-            "initialClientHeight"
-        )
-        parsed["jpeg_quality"] = get_int("jpeg_quality")
-        parsed["paint_over_jpeg_quality"] = get_int(
-            "paint_over_jpeg_quality"
-        )
-        parsed["use_cpu"] = get_bool("use_cpu")
-        parsed["h264_paintover_crf"] = get_int("h264_paintover_crf")
-        parsed["h264_paintover_burst_frames"] = get_int("h264_paintover_burst_frames")
-        parsed["use_paint_over_quality"] = get_bool("use_paint_over_quality")
-        parsed["scaling_dpi"] = get_int("scaling_dpi")
-        parsed["enable_binary_clipboard"] = get_bool("enable_binary_clipboard")
-        parsed["displayId"] = get_str("displayId")
-        parsed["displayPosition"] = get_str("displayPosition")
-        data_logger.debug(f"Parsed client settings: {parsed}")
+        settings_data = json_loads(payload_str)
+        parsed = {
+            key: (convert(value) if (value := settings_data.get(key)) is not None else None)
+            for key, convert in SETTINGS_PAYLOAD_SCHEMA
+        }
+        data_logger.debug("Parsed client settings: %s", parsed)
         return parsed
 
     async def _apply_client_settings(
@@ -1316,12 +1809,15 @@ class DataStreamingServer:
             data_logger.error(f"Cannot apply settings for unknown display_id '{display_id}'")
             return
         display_state = self.display_clients[display_id]
+        if not is_initial_settings and display_state.get('last_applied_settings') == settings:
+            data_logger.debug("Client settings for '%s' are unchanged. Nothing to apply.", display_id)
+            return
         data_logger.info(
             f"Applying and sanitizing client settings for '{display_id}' (initial={is_initial_settings})"
         )
         def sanitize_value(name, client_value):
             """Clamps ranges, validates enums, and enforces bools against server limits."""
-            setting_def = next((s for s in SETTING_DEFINITIONS if s['name'] == name), None)
+            setting_def = SETTING_DEFINITIONS_BY_NAME.get(name)
             if not setting_def:
                 return None
             server_limit = getattr(self.cli_args, name)
@@ -1405,17 +1901,11 @@ class DataStreamingServer:
                 if display_id == 'primary':
                     self.app.display_width = target_w
                     self.app.display_height = target_h
-            display_state["encoder"] = sanitize_value("encoder", settings.get("encoder"))
-            display_state["framerate"] = sanitize_value("framerate", settings.get("framerate"))
-            display_state["h264_crf"] = sanitize_value("h264_crf", settings.get("h264_crf"))
-            display_state["h264_fullcolor"] = sanitize_value("h264_fullcolor", settings.get("h264_fullcolor"))
-            display_state["h264_streaming_mode"] = sanitize_value("h264_streaming_mode", settings.get("h264_streaming_mode"))
-            display_state["jpeg_quality"] = sanitize_value("jpeg_quality", settings.get("jpeg_quality"))
-            display_state["paint_over_jpeg_quality"] = sanitize_value("paint_over_jpeg_quality", settings.get("paint_over_jpeg_quality"))
-            display_state["use_paint_over_quality"] = sanitize_value("use_paint_over_quality", settings.get("use_paint_over_quality"))
-            display_state["h264_paintover_crf"] = sanitize_value("h264_paintover_crf", settings.get("h264_paintover_crf"))
-            display_state["h264_paintover_burst_frames"] = sanitize_value("h264_paintover_burst_frames", settings.get("h264_paintover_burst_frames"))
-            display_state["use_cpu"] = sanitize_value("use_cpu", settings.get("use_cpu"))
+            video_params_changed = False
+            for key in CAPTURE_VIDEO_SETTINGS:
+                display_state[key] = sanitize_value(key, settings.get(key))
+                if display_state[key] != old_settings.get(key):
+                    video_params_changed = True
             self.app.audio_bitrate = sanitize_value("audio_bitrate", settings.get("audio_bitrate"))
             display_state["audio_bitrate"] = self.app.audio_bitrate
             if self.input_handler:
@@ -1430,17 +1920,10 @@ class DataStreamingServer:
                     await set_cursor_size(new_cursor_size)
             display_state["scaling_dpi"] = new_dpi
             dimensional_change = resolution_actually_changed or position_actually_changed
-            video_params_changed = any(
-                display_state.get(key) != old_settings.get(key)
-                for key in [
-                    'encoder', 'framerate', 'h264_crf', 'h264_fullcolor', 'h264_streaming_mode',
-                    'jpeg_quality', 'paint_over_jpeg_quality', 'use_cpu', 'h264_paintover_crf',
-                    'h264_paintover_burst_frames', 'use_paint_over_quality'
-                ]
-            )
             audio_bitrate_changed = self.app.audio_bitrate != old_settings.get('audio_bitrate')
             if audio_bitrate_changed and self.is_pcmflux_capturing:
                 audio_restart_needed = True
+            display_state['last_applied_settings'] = settings
         if audio_restart_needed:
             data_logger.info("Restarting audio pipeline due to settings update.")
             await self._stop_pcmflux_pipeline()
@@ -1454,23 +1937,9 @@ class DataStreamingServer:
         elif video_params_changed:
             data_logger.info(
                 f"Video parameters changed for '{display_id}'. "
-                "Restarting its capture stream without reconfiguring displays."
+                "Scheduling a restart of its capture stream without reconfiguring displays."
             )
-            if hasattr(self, 'display_layouts') and display_id in self.display_layouts:
-                layout = self.display_layouts[display_id]
-                await self._stop_capture_for_display(display_id)
-                await self._start_capture_for_display(
-                    display_id=display_id,
-                    width=layout['w'], height=layout['h'],
-                    x_offset=layout['x'], y_offset=layout['y']
-                )
-                await self._start_backpressure_task_if_needed(display_id)
-            else:
-                data_logger.warning(
-                    f"Cannot restart capture for '{display_id}': no layout found. "
-                    "Triggering full reconfiguration as a fallback."
-                )
-                await self.reconfigure_displays()
+            self._schedule_capture_restart(display_id)
         if is_initial_settings and self.client_settings_received and not self.client_settings_received.is_set():
             self.client_settings_received.set()
 
@@ -1492,15 +1961,15 @@ class DataStreamingServer:
             self.last_connection_times.popitem(last=False)
         raddr = websocket.remote_address
         data_logger.info(f"Data WebSocket connected from {raddr}")
+        _set_tcp_nodelay(websocket)
         self.clients.add(websocket)
+        self._primary_viewers = None
         self.data_ws = (
             websocket 
         )
         self.capture_loop = self.capture_loop or asyncio.get_running_loop()
         self.client_settings_received = asyncio.Event()
         initial_settings_processed = False
-        self._sent_frame_timestamps.clear()
-        self._rtt_samples.clear()
         self._smoothed_rtt_ms = 0.0
 
         client_display_id = None
@@ -1509,46 +1978,33 @@ class DataStreamingServer:
             await websocket.send(f"MODE {self.mode}")
         except websockets.exceptions.ConnectionClosed:
             self.clients.discard(websocket)
+            self._primary_viewers = None
             if self.data_ws is websocket:
                 self.data_ws = None
             return
 
-        if self.app and self.app.last_cursor_sent:
+        if self.app and self.app.last_cursor_message:
             data_logger.info(f"Sending last known cursor to new client {raddr}")
             try:
-                msg_str = json.dumps(self.app.last_cursor_sent)
-                await websocket.send(f"cursor,{msg_str}")
+                await websocket.send(self.app.last_cursor_message)
             except Exception as e:
                 data_logger.warning(f"Failed to send initial cursor to new client {raddr}: {e}")
 
-        server_settings_payload = {"type": "server_settings", "settings": {}}
-        for setting_def in SETTING_DEFINITIONS:
-            name = setting_def['name']
-            if name in ['port', 'dri_node', 'debug', 'audio_device_name', 'watermark_path']:
-                continue
-            value = getattr(settings, name)
-            if setting_def['type'] == 'bool':
-                bool_val, is_locked = value
-                payload_entry = {'value': bool_val, 'locked': is_locked}
-            else:
-                payload_entry = {'value': value}
-
-            if setting_def['type'] == 'range':
-                payload_entry['min'], payload_entry['max'] = value
-                if 'meta' in setting_def and 'default_value' in setting_def['meta']:
-                    payload_entry['default'] = setting_def['meta']['default_value']
-            elif setting_def['type'] in ['enum', 'list']:
-                if 'meta' in setting_def and 'allowed' in setting_def['meta']:
-                    payload_entry['allowed'] = setting_def['meta']['allowed']
-            server_settings_payload["settings"][name] = payload_entry
         try:
-            await websocket.send(json.dumps(server_settings_payload))
+            await websocket.send(self._get_server_settings_message())
         except websockets.exceptions.ConnectionClosed:
             self.clients.discard(websocket)
+            self._primary_viewers = None
             if self.data_ws is websocket:
                 self.data_ws = None
             return
 
+        client_send_queue = asyncio.Queue(maxsize=CLIENT_SEND_QUEUE_SIZE)
+        self.client_send_queues[websocket] = client_send_queue
+        client_send_relay_task = asyncio.create_task(
+            self._client_send_relay(websocket, client_send_queue)
+        )
+
         self._last_adjustment_time = self._last_time_client_ok = time.monotonic()
         self._active_pipeline_last_sent_frame_id = 0
         self._client_acknowledged_frame_id = -1
@@ -1568,8 +2024,39 @@ class DataStreamingServer:
         pulse = None
         
         # Audio buffer management
-        audio_buffer = []
-        buffer_max_size = 24000 * 2 * 2  # 2 seconds at 24kHz, 16-bit mono
+        audio_buffer = ByteRingBuffer(24000 * 2 * 2)  # 2 seconds at 24kHz, 16-bit mono
+        mic_overflowing = False
+        mic_write_queue = asyncio.Queue(maxsize=MIC_WRITE_QUEUE_SIZE)
+        mic_writer_task = None
+        mic_flush_handle = None
+
+        async def mic_writer():
+            """Writes queued mic blocks to PulseAudio on the mic thread, off the event loop."""
+            nonlocal pa_stream
+            loop = asyncio.get_running_loop()
+            while True:
+                data_to_write = await mic_write_queue.get()
+                stream = pa_stream
+                if stream is None:
+                    continue
+                try:
+                    await loop.run_in_executor(self._mic_executor, stream.write, data_to_write)
+                except Exception as e_pa_write:
+                    data_logger.error(f"PulseAudio stream write error: {e_pa_write}")
+                    if pa_stream is stream:
+                        pa_stream = None
+                    audio_buffer.clear()
+                    try:
+                        await loop.run_in_executor(self._mic_executor, stream.close)
+                    except Exception:
+                        pass
+
+        def flush_mic_tail():
+            """Queues mic audio that did not fill a whole block before the timeout."""
+            nonlocal mic_flush_handle
+            mic_flush_handle = None
+            if len(audio_buffer):
+                _put_nowait_or_drop(mic_write_queue, audio_buffer.read(len(audio_buffer)))
         
         # Define virtual source details
         virtual_source_name = "SelkiesVirtualMic"
@@ -1580,23 +2067,12 @@ class DataStreamingServer:
                 f"Data WS handler for {raddr}: Critical - self.input_handler (global) is not set. Input processing will fail."
             )
 
-        self._shared_stats_ws = {}
-        gpu_id_for_stats = getattr(self.app, "gpu_id", GPU_ID_DEFAULT)
-        self._system_monitor_task_ws = asyncio.create_task(
-            _collect_system_stats_ws(self._shared_stats_ws)
-        )
-        if GPUtil.getGPUs():
-            self._gpu_monitor_task_ws = asyncio.create_task(
-                _collect_gpu_stats_ws(self._shared_stats_ws, gpu_id=gpu_id_for_stats)
-            )
-        self._stats_sender_task_ws = asyncio.create_task(
+        self._start_stats_monitors()
+        stats_sender_task = asyncio.create_task(
             _send_stats_periodically_ws(
                 websocket, self._shared_stats_ws
             )
         )
-        self._network_monitor_task_ws = asyncio.create_task(
-            _collect_network_stats_ws(self._shared_stats_ws, self)
-        )
 
         try:
             if PULSEAUDIO_AVAILABLE:
@@ -1613,7 +2089,8 @@ class DataStreamingServer:
 
             async for message in websocket:
                 if isinstance(message, bytes):
-                    msg_type, payload = message[0], message[1:]
+                    # A view, so upload and mic payloads are not copied out of the frame.
+                    msg_type, payload = message[0], memoryview(message)[1:]
                     if msg_type == 0x01:
                         if (
                             active_upload_target_path_conn
@@ -1621,17 +2098,22 @@ class DataStreamingServer:
                             in active_uploads_by_path_conn
                         ):
                             try:
-                                active_uploads_by_path_conn[
-                                    active_upload_target_path_conn
-                                ].write(payload)
+                                # Disk writes can block once the page cache fills up,
+                                # so they run on the upload thread, in order.
+                                await asyncio.get_running_loop().run_in_executor(
+                                    self._upload_executor,
+                                    _write_all,
+                                    active_uploads_by_path_conn[active_upload_target_path_conn],
+                                    payload,
+                                )
                             except Exception as e_write:
                                 data_logger.error(
                                     f"File write error for {active_upload_target_path_conn}: {e_write}"
                                 )
                                 try:
-                                    active_uploads_by_path_conn[
+                                    os.close(active_uploads_by_path_conn[
                                         active_upload_target_path_conn
-                                    ].close()
+                                    ])
                                     os.remove(active_upload_target_path_conn)
                                 except Exception:
                                     pass
@@ -1660,12 +2142,9 @@ class DataStreamingServer:
                                 "Performing PulseAudio virtual microphone setup check..."
                             )
                             try:
-                                existing_source_info = None
-                                source_list = pulse.source_list()
-                                for source_obj in source_list:
-                                    if source_obj.name == virtual_source_name:
-                                        existing_source_info = source_obj
-                                        break
+                                # One source_list() round-trip, looked up by name below.
+                                sources_by_name = {source.name: source for source in pulse.source_list()}
+                                existing_source_info = sources_by_name.get(virtual_source_name)
 
                                 if existing_source_info:
                                     data_logger.info(
@@ -1698,12 +2177,8 @@ class DataStreamingServer:
                                         f"Loaded module-virtual-source with index {pa_module_index} for '{virtual_source_name}'."
                                     )
 
-                                    new_source_info = None
-                                    source_list_after_load = pulse.source_list()
-                                    for source_obj_after in source_list_after_load:
-                                        if source_obj_after.name == virtual_source_name:
-                                            new_source_info = source_obj_after
-                                            break
+                                    sources_by_name = {source.name: source for source in pulse.source_list()}
+                                    new_source_info = sources_by_name.get(virtual_source_name)
                                     if new_source_info:
                                         data_logger.info(
                                             f"Successfully verified creation of source '{virtual_source_name}' (Index: {new_source_info.index})."
@@ -1725,34 +2200,24 @@ class DataStreamingServer:
                                             pa_module_index = None
 
                                 if mic_setup_done:
-                                    current_source_list = (
-                                        pulse.source_list()
-                                    )
                                     if self.is_pcmflux_capturing:
                                         try:
-                                            source_outputs = pulse.source_output_list()
-                                            pcmflux_output = None
-                                            
-                                            for output in source_outputs:
-                                                if hasattr(output, 'proplist') and output.proplist.get('application.name') == 'pcmflux':
-                                                    pcmflux_output = output
-                                                    break
+                                            pcmflux_output = next(
+                                                (
+                                                    output for output in pulse.source_output_list()
+                                                    if hasattr(output, 'proplist') and output.proplist.get('application.name') == 'pcmflux'
+                                                ),
+                                                None,
+                                            )
                                             
                                             if pcmflux_output:
-                                                connected_source = None
-                                                for source in current_source_list:
-                                                    if source.index == pcmflux_output.source:
-                                                        connected_source = source
-                                                        break
+                                                sources_by_index = {source.index: source for source in sources_by_name.values()}
+                                                connected_source = sources_by_index.get(pcmflux_output.source)
                                                 if connected_source and connected_source.name != self.audio_device_name:
                                                     data_logger.warning(
                                                         f"pcmflux connected to wrong source '{connected_source.name}', moving to '{self.audio_device_name}'"
                                                     )
-                                                    correct_source = None
-                                                    for source in current_source_list:
-                                                        if source.name == self.audio_device_name:
-                                                            correct_source = source
-                                                            break
+                                                    correct_source = sources_by_name.get(self.audio_device_name)
                                                     if correct_source:
                                                         pulse.source_output_move(pcmflux_output.index, correct_source.index)
                                                         data_logger.info(
@@ -1815,17 +2280,23 @@ class DataStreamingServer:
                                     device_name="input",
                                 )
                             
-                            audio_buffer.extend(payload)
-                            
-                            if len(audio_buffer) > buffer_max_size:
-                                audio_buffer = audio_buffer[len(audio_buffer)//2:]
+                            dropped_mic_bytes = audio_buffer.write(payload)
+                            if dropped_mic_bytes and not mic_overflowing:
                                 data_logger.warning("Audio buffer overflow, dropping old audio to prevent drift")
+                            # Warn once per overflow episode rather than per packet.
+                            mic_overflowing = bool(dropped_mic_bytes)
                             
-                            if pa_stream and len(audio_buffer) >= len(payload):
-                                chunk_size = len(payload)
-                                data_to_write = bytes(audio_buffer[:chunk_size])
-                                audio_buffer[:chunk_size] = []
-                                pa_stream.write(data_to_write)
+                            if mic_writer_task is None:
+                                mic_writer_task = asyncio.create_task(mic_writer())
+                            # Coalesce small packets into block-sized writes, each
+                            # of which is a blocking round-trip to PulseAudio. A
+                            # full queue drops the block rather than stalling.
+                            while len(audio_buffer) >= MIC_FLUSH_BYTES:
+                                _put_nowait_or_drop(mic_write_queue, audio_buffer.read(MIC_FLUSH_BYTES))
+                            if len(audio_buffer) and mic_flush_handle is None:
+                                mic_flush_handle = asyncio.get_running_loop().call_later(
+                                    MIC_FLUSH_TIMEOUT_S, flush_mic_tail
+                                )
                                     
                         except Exception as e_pa_write:
                             data_logger.error(
@@ -1837,10 +2308,52 @@ class DataStreamingServer:
                                     pa_stream.close()
                                 except:
                                     pass
+                                pa_stream = None
                             audio_buffer.clear()
 
                 elif isinstance(message, str):
-                    if message.startswith("FILE_UPLOAD_START:"):
+                    if not message.startswith(SERVER_TEXT_MESSAGE_PREFIXES):
+                        # Input events are the bulk of text traffic and never match
+                        # a server verb, so skip the prefix chain below.
+                        if self.input_handler and hasattr(
+                            self.input_handler, "on_message"
+                        ):
+                            await self.input_handler.on_message(message, client_display_id)
+                    elif message.startswith("CLIENT_FRAME_ACK"):
+                        target_display_id = client_display_id
+                        if not target_display_id:
+                            continue
+                        try:
+                            parts = message.split(" ", 2)
+                            acked_frame_id = -1
+                            if len(parts) >= 2:
+                                acked_frame_id = int(parts[-1])
+                            else:
+                                raise ValueError("ACK message has too few parts.")
+
+                            display_state = self.display_clients.get(target_display_id)
+                            if display_state:
+                                now = time.monotonic()
+                                display_state['acknowledged_frame_id'] = acked_frame_id
+                                display_state['last_ack_update_time'] = now
+                                
+                                sent_ts = display_state.get('sent_timestamps')
+                                send_time = sent_ts.pop(acked_frame_id) if sent_ts is not None else None
+                                if send_time is not None:
+                                    rtt_sample_ms = (now - send_time) * 1000.0
+                                    if rtt_sample_ms >= 0:
+                                        # Exponential moving average, seeded with the first sample
+                                        # so it does not start biased towards zero.
+                                        smoothed_rtt = display_state.get('smoothed_rtt', 0.0)
+                                        if smoothed_rtt > 0:
+                                            smoothed_rtt += RTT_SMOOTHING_ALPHA * (rtt_sample_ms - smoothed_rtt)
+                                        else:
+                                            smoothed_rtt = rtt_sample_ms
+                                        display_state['smoothed_rtt'] = smoothed_rtt
+                        except (IndexError, ValueError):
+                            data_logger.warning(f"Malformed CLIENT_FRAME_ACK from {raddr}: {message}")
+
+                    elif message.startswith("FILE_UPLOAD_START:"):
                         if 'upload' not in settings.file_transfers:
                             data_logger.warning("Client tried to upload a file, but uploads are disabled by server settings.")
                             continue
@@ -1848,38 +2361,34 @@ class DataStreamingServer:
                             data_logger.error("Upload dir invalid, skipping upload.")
                             continue
                         try:
-                            _, rel_path_from_client, size_str = message.split(":", 2)
-                            file_size = int(size_str)
-
-                            sane_rel_path = rel_path_from_client.strip('/\\')
-                            sane_rel_path = os.path.normpath(sane_rel_path)
-
-                            path_components = [comp for comp in sane_rel_path.split(os.sep) if comp and comp != '.']
-
-                            if not path_components or \
-                               sane_rel_path.startswith(os.sep) or \
-                               sane_rel_path.startswith('/') or \
-                               sane_rel_path.startswith('\\') or \
-                               ".." in path_components:
+                            upload_start = FILE_UPLOAD_START_PATTERN.match(message)
+                            if not upload_start:
+                                raise ValueError(message)
+                            rel_path_from_client = upload_start.group("path")
+                            file_size = int(upload_start.group("size"))
+
+                            # Leading separators are stripped, so the normalized path is
+                            # relative and only a ".." component can escape the upload dir.
+                            sane_rel_path = os.path.normpath(rel_path_from_client.strip('/\\'))
+                            path_components = sane_rel_path.split(os.sep)
+
+                            if sane_rel_path == "." or ".." in path_components:
                                 data_logger.error(f"Invalid or malicious relative path from client: '{rel_path_from_client}'. Discarding.")
                                 continue
-                            
-                            sane_rel_path = os.path.join(*path_components)
 
                             final_server_path = os.path.join(upload_dir_path, sane_rel_path)
 
-                            real_upload_dir = os.path.realpath(upload_dir_path)
                             intended_parent_dir_abs = os.path.abspath(os.path.dirname(final_server_path))
-                            real_upload_dir_abs = os.path.abspath(real_upload_dir)
+                            real_upload_dir_abs = upload_dir_real_path
 
-                            if not intended_parent_dir_abs.startswith(real_upload_dir_abs):
+                            if not _is_path_within(intended_parent_dir_abs, real_upload_dir_abs):
                                  data_logger.error(f"Path escape attempt detected: '{final_server_path}' (from client: '{rel_path_from_client}') is outside of '{real_upload_dir_abs}'. Discarding.")
                                  continue
 
                             target_dir = os.path.dirname(final_server_path)
                             
                             if target_dir and target_dir != real_upload_dir_abs and not os.path.exists(target_dir):
-                                if not os.path.abspath(target_dir).startswith(real_upload_dir_abs):
+                                if not _is_path_within(os.path.abspath(target_dir), real_upload_dir_abs):
                                     data_logger.error(f"Directory creation escape attempt: '{target_dir}' is outside of '{real_upload_dir_abs}'. Discarding.")
                                     continue
                                 try:
@@ -1895,12 +2404,17 @@ class DataStreamingServer:
                                 in active_uploads_by_path_conn
                             ):
                                 try:
-                                    active_uploads_by_path_conn[active_upload_target_path_conn].close()
+                                    os.close(active_uploads_by_path_conn[active_upload_target_path_conn])
                                 except Exception as e_close_old:
                                     data_logger.warning(f"Error closing previous upload stream {active_upload_target_path_conn}: {e_close_old}")
                                 del active_uploads_by_path_conn[active_upload_target_path_conn]
 
-                            active_uploads_by_path_conn[final_server_path] = open(final_server_path, "wb")
+                            upload_fd = os.open(
+                                final_server_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666
+                            )
+                            if hasattr(os, "posix_fadvise"):
+                                os.posix_fadvise(upload_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                            active_uploads_by_path_conn[final_server_path] = upload_fd
                             active_upload_target_path_conn = final_server_path
                             data_logger.info(
                                 f"Upload started: {final_server_path} (client rel_path: '{rel_path_from_client}', size: {file_size})"
@@ -1920,9 +2434,9 @@ class DataStreamingServer:
                             and active_upload_target_path_conn
                             in active_uploads_by_path_conn
                         ):
-                            active_uploads_by_path_conn[
+                            os.close(active_uploads_by_path_conn[
                                 active_upload_target_path_conn
-                            ].close()
+                            ])
                             data_logger.info(
                                 f"Upload finished: {active_upload_target_path_conn}"
                             )
@@ -1938,9 +2452,9 @@ class DataStreamingServer:
                             and active_upload_target_path_conn
                             in active_uploads_by_path_conn
                         ):
-                            active_uploads_by_path_conn[
+                            os.close(active_uploads_by_path_conn[
                                 active_upload_target_path_conn
-                            ].close()
+                            ])
                             try:
                                 os.remove(active_upload_target_path_conn)
                             except OSError:
@@ -1955,6 +2469,10 @@ class DataStreamingServer:
                             _, payload_str = message.split(",", 1)
                             parsed_settings = self._parse_settings_payload(payload_str)
                             display_id = parsed_settings.get("displayId", "primary")
+                            if parsed_settings.get("binary_clipboard_frames"):
+                                self.binary_clipboard_frame_clients.add(websocket)
+                            else:
+                                self.binary_clipboard_frame_clients.discard(websocket)
 
                             if display_id != 'primary':
                                 second_screen_enabled, _ = self.cli_args.second_screen
@@ -2016,8 +2534,7 @@ class DataStreamingServer:
                                     'width': 0, 'height': 0, 'position': 'right',
                                     'acknowledged_frame_id': -1,
                                     'last_sent_frame_id': 0,
-                                    'sent_timestamps': OrderedDict(),
-                                    'rtt_samples': deque(maxlen=RTT_SMOOTHING_SAMPLES),
+                                    'sent_timestamps': FrameTimestampRing(SENT_FRAME_TIMESTAMP_HISTORY_SIZE),
                                     'smoothed_rtt': 0.0,
                                     'backpressure_enabled': True,
                                     'backpressure_task': None,
@@ -2036,16 +2553,18 @@ class DataStreamingServer:
                                     'h264_paintover_burst_frames': self._initial_h264_paintover_burst_frames,
                                     'use_paint_over_quality': self._initial_use_paint_over_quality,
                                 }
+                                self._primary_viewers = None
                             else:
                                 data_logger.info(f"Client is taking over existing display '{display_id}'. Updating state for new connection.")
                                 display_state = self.display_clients[display_id]
                                 display_state['ws'] = websocket
+                                self._primary_viewers = None
                                 display_state['video_active'] = True
                                 display_state['acknowledged_frame_id'] = -1
                                 display_state['last_ack_update_time'] = time.monotonic()
                                 display_state['sent_timestamps'].clear()
-                                display_state['rtt_samples'].clear()
                                 display_state['smoothed_rtt'] = 0.0
+                                display_state.pop('last_applied_settings', None)
  
                             await self._apply_client_settings(
                                 websocket,
@@ -2073,72 +2592,6 @@ class DataStreamingServer:
                                 f"Error processing SETTINGS: {e_set}", exc_info=True
                             )
 
-                    elif message.startswith("CLIENT_FRAME_ACK"):
-                        try:
-                            parts = message.split(" ", 2)
-                            acked_frame_id = -1
-                            target_display_id = client_display_id
-                            if not target_display_id:
-                                continue
-                            if len(parts) >= 2:
-                                acked_frame_id = int(parts[-1])
-                            else:
-                                raise ValueError("ACK message has too few parts.")
-
-                            display_state = self.display_clients.get(target_display_id)
-                            if display_state:
-                                display_state['acknowledged_frame_id'] = acked_frame_id
-                                display_state['last_ack_update_time'] = time.monotonic()
-                                
-                                sent_ts = display_state.get('sent_timestamps')
-                                if sent_ts and acked_frame_id in sent_ts:
-                                    send_time = sent_ts.pop(acked_frame_id)
-                                    rtt_sample_ms = (time.monotonic() - send_time) * 1000.0
-                                    if rtt_sample_ms >= 0:
-                                        rtt_samples = display_state.get('rtt_samples')
-                                        if rtt_samples is not None:
-                                            rtt_samples.append(rtt_sample_ms)
-                                            if rtt_samples:
-                                                display_state['smoothed_rtt'] = sum(rtt_samples) / len(rtt_samples)
-                        except (IndexError, ValueError):
-                            data_logger.warning(f"Malformed CLIENT_FRAME_ACK from {raddr}: {message}")
-
-                    elif message.startswith("FILE_UPLOAD_END:"):
-                        if (
-                            active_upload_target_path_conn
-                            and active_upload_target_path_conn
-                            in active_uploads_by_path_conn
-                        ):
-                            active_uploads_by_path_conn[
-                                active_upload_target_path_conn
-                            ].close()
-                            data_logger.info(
-                                f"Upload finished: {active_upload_target_path_conn}"
-                            )
-                            del active_uploads_by_path_conn[
-                                active_upload_target_path_conn
-                            ]
-                        active_upload_target_path_conn = None
-
-                    elif message.startswith("FILE_UPLOAD_ERROR:"):
-                        data_logger.error(f"Client reported upload error: {message}")
-                        if (
-                            active_upload_target_path_conn
-                            and active_upload_target_path_conn
-                            in active_uploads_by_path_conn
-                        ):
-                            active_uploads_by_path_conn[
-                                active_upload_target_path_conn
-                            ].close()
-                            try:
-                                os.remove(active_upload_target_path_conn)
-                            except OSError:
-                                pass
-                            del active_uploads_by_path_conn[
-                                active_upload_target_path_conn
-                            ]
-                        active_upload_target_path_conn = None
-
                     elif message == "START_VIDEO":
                         if client_display_id and client_display_id in self.display_clients:
                             data_logger.info(f"Received START_VIDEO for '{client_display_id}'. Starting its stream.")
@@ -2316,8 +2769,12 @@ class DataStreamingServer:
             data_logger.info(f"Cleaning up Data WS handler for {raddr} (Display ID: {client_display_id})...")
 
             self.clients.discard(websocket)
+            self._primary_viewers = None
             if self.data_ws is websocket:
                 self.data_ws = None
+            self.client_send_queues.pop(websocket, None)
+            self.binary_clipboard_frame_clients.discard(websocket)
+            client_send_relay_task.cancel()
             
             disconnected_display_id = None
             for disp_id, client_info in self.display_clients.items():
@@ -2327,46 +2784,22 @@ class DataStreamingServer:
             
             if disconnected_display_id:
                 del self.display_clients[disconnected_display_id]
+                await self._cancel_pending_capture_restarts(disconnected_display_id)
+                self._primary_viewers = None
                 data_logger.info(f"Client for '{disconnected_display_id}' disconnected. Removing and triggering full display reconfiguration.")
                 await self.reconfigure_displays()
             else:
                 data_logger.info(f"Unregistered client at {raddr} disconnected. No display reconfiguration needed.")
 
-            if "_stats_sender_task_ws" in locals():
-                _task_to_cancel = locals()["_stats_sender_task_ws"]
-                if _task_to_cancel and not _task_to_cancel.done():
-                    _task_to_cancel.cancel()
-                    try:
-                        await _task_to_cancel
-                    except asyncio.CancelledError:
-                        pass
-
-            if "_system_monitor_task_ws" in locals():
-                _task_to_cancel = locals()["_system_monitor_task_ws"]
-                if _task_to_cancel and not _task_to_cancel.done():
-                    _task_to_cancel.cancel()
-                    try:
-                        await _task_to_cancel
-                    except asyncio.CancelledError:
-                        pass
-
-            if "_gpu_monitor_task_ws" in locals():
-                _task_to_cancel = locals()["_gpu_monitor_task_ws"]
-                if _task_to_cancel and not _task_to_cancel.done():
-                    _task_to_cancel.cancel()
-                    try:
-                        await _task_to_cancel
-                    except asyncio.CancelledError:
-                        pass
+            if not stats_sender_task.done():
+                stats_sender_task.cancel()
+                try:
+                    await stats_sender_task
+                except asyncio.CancelledError:
+                    pass
 
-            if "_network_monitor_task_ws" in locals():
-                _task_to_cancel = locals()["_network_monitor_task_ws"]
-                if _task_to_cancel and not _task_to_cancel.done():
-                    _task_to_cancel.cancel()
-                    try:
-                        await _task_to_cancel
-                    except asyncio.CancelledError:
-                        pass
+            if not self.clients:
+                await self._stop_stats_monitors()
 
             if (
                 self._frame_backpressure_task
@@ -2383,9 +2816,23 @@ class DataStreamingServer:
                         f"Client {raddr} disconnected, but other clients remain. Frame backpressure task continues."
                     )
 
-            if "pa_stream" in locals() and locals()["pa_stream"]:
+            if mic_flush_handle is not None:
+                mic_flush_handle.cancel()
+                mic_flush_handle = None
+
+            if mic_writer_task is not None:
+                mic_writer_task.cancel()
                 try:
-                    locals()["pa_stream"].close()
+                    await mic_writer_task
+                except asyncio.CancelledError:
+                    pass
+
+            if pa_stream:
+                try:
+                    # Runs after any write still in flight on the mic thread.
+                    await asyncio.get_running_loop().run_in_executor(
+                        self._mic_executor, pa_stream.close
+                    )
                     data_logger.debug(f"Closed PulseAudio stream for {raddr}.")
                 except Exception as e_pa_close:
                     data_logger.error(
@@ -2426,9 +2873,12 @@ class DataStreamingServer:
                 _local_active_path = locals()["active_upload_target_path_conn"]
                 _local_active_uploads = locals()["active_uploads_by_path_conn"]
                 try:
-                    file_handle = _local_active_uploads.pop(_local_active_path, None)
-                    if file_handle:
-                        file_handle.close()
+                    upload_fd = _local_active_uploads.pop(_local_active_path, None)
+                    if upload_fd is not None:
+                        # Queued behind any write still running on the upload thread.
+                        await asyncio.get_running_loop().run_in_executor(
+                            self._upload_executor, os.close, upload_fd
+                        )
                     os.remove(_local_active_path)
                     data_logger.info(
                         f"Cleaned up incomplete file upload: {_local_active_path} for {raddr}"
@@ -2452,6 +2902,9 @@ class DataStreamingServer:
 
     async def run_server(self):
         self.stop_server = asyncio.Future()
+        # GPUtil forks nvidia-smi, so probe for GPUs once, off the event loop.
+        loop = asyncio.get_running_loop()
+        self._has_gpu = bool(await loop.run_in_executor(None, GPUtil.getGPUs))
         while not self.stop_server.done():
             _current_server_instance = None
             wait_closed_task = None
@@ -2461,6 +2914,7 @@ class DataStreamingServer:
                     "0.0.0.0",
                     self.port,
                     compression=None,
+                    write_limit=(WS_WRITE_LIMIT_HIGH, WS_WRITE_LIMIT_LOW),
                     ping_interval=20,
                     ping_timeout=20,
                 ) as server_obj:
@@ -2509,6 +2963,38 @@ class DataStreamingServer:
                         pass
         data_logger.info(f"Data WS run_server loop for port {self.port} has finished.")
 
+    def _start_stats_monitors(self):
+        """
+        Starts the system, GPU and network samplers if they are not running.
+        They are shared by all clients, which only run their own sender task.
+        """
+        if self._system_monitor_task_ws is None or self._system_monitor_task_ws.done():
+            self._system_monitor_task_ws = asyncio.create_task(
+                _collect_system_stats_ws(self._shared_stats_ws)
+            )
+        if self._has_gpu and (self._gpu_monitor_task_ws is None or self._gpu_monitor_task_ws.done()):
+            gpu_id_for_stats = getattr(self.app, "gpu_id", GPU_ID_DEFAULT)
+            self._gpu_monitor_task_ws = asyncio.create_task(
+                _collect_gpu_stats_ws(self._shared_stats_ws, gpu_id=gpu_id_for_stats)
+            )
+        if self._network_monitor_task_ws is None or self._network_monitor_task_ws.done():
+            self._network_monitor_task_ws = asyncio.create_task(
+                _collect_network_stats_ws(self._shared_stats_ws, self)
+            )
+
+    async def _stop_stats_monitors(self):
+        tasks = (self._system_monitor_task_ws, self._gpu_monitor_task_ws, self._network_monitor_task_ws)
+        self._system_monitor_task_ws = None
+        self._gpu_monitor_task_ws = None
+        self._network_monitor_task_ws = None
+        for task in tasks:
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
     async def stop(self):
         data_logger.info(f"Stopping Data WebSocket Server on port {self.port}...")
         if self.stop_server and not self.stop_server.done():
@@ -2524,6 +3010,7 @@ class DataStreamingServer:
             except Exception as e_close:
                 data_logger.error(f"Error on server.wait_closed(): {e_close}")
         self.server = None
+        await self._stop_stats_monitors()
         await self.shutdown_pipelines()
         data_logger.info(f"Data WS on port {self.port} stop procedure complete.")
 
@@ -2531,6 +3018,7 @@ class DataStreamingServer:
         """Removes a client and triggers reconfiguration if necessary."""
         data_logger.info(f"Cleaning up Data WS handler for {websocket.remote_address} (Display ID: {display_id})...")
         self.display_clients.pop(display_id, None)
+        self._primary_viewers = None
 
         if self._is_reconfiguring:
             data_logger.warning(f"Client '{display_id}' disconnected DURING a reconfiguration. "
@@ -2575,6 +3063,9 @@ class DataStreamingServer:
         except Exception as e:
             data_logger.error(f"Exception during '{description}': {e}", exc_info=True)
             return False
+        finally:
+            if cmd and cmd[0] == "xrandr":
+                _invalidate_xrandr_cache()
 
     async def _get_current_monitors(self):
         """Parses `xrandr --listmonitors` to get names of existing logical monitors."""
@@ -2603,9 +3094,12 @@ class DataStreamingServer:
         await self._ensure_backpressure_task_is_stopped(display_id)
         capture_info = self.capture_instances.pop(display_id, None)
         if capture_info:
-            capture_module = capture_info.get('module')
+            capture_module = capture_info.pop('module', None)
             if capture_module:
-                await self.capture_loop.run_in_executor(None, capture_module.stop_capture)
+                # As with pcmflux, let the final reference drop on the executor thread.
+                stop_future = self.capture_loop.run_in_executor(self._capture_executor, capture_module.stop_capture)
+                del capture_module
+                await stop_future
             sender_task = capture_info.get('sender_task')
             if sender_task and not sender_task.done():
                 sender_task.cancel()
@@ -2613,6 +3107,76 @@ class DataStreamingServer:
 
         data_logger.info(f"Successfully stopped all streams for display '{display_id}'.")
  
+    def _schedule_capture_restart(self, display_id: str):
+        """
+        Restarts a display's capture once settings have been quiet for
+        CAPTURE_RESTART_DEBOUNCE_S, so a burst of changes costs one restart.
+        A restart that is already stopping/starting the capture is left to
+        finish; the new one runs after it.
+        """
+        pending = self._pending_capture_restarts.get(display_id)
+        if pending and pending is not self._capture_restarts_in_progress.get(display_id):
+            pending.cancel()
+        self._pending_capture_restarts[display_id] = asyncio.create_task(
+            self._restart_capture_after_delay(display_id)
+        )
+
+    async def _cancel_pending_capture_restarts(self, display_id=None):
+        """
+        Cancels capture restarts that have not started yet, for every display
+        or only display_id, and waits for one that is already running.
+        """
+        tasks = {
+            task for running_id, task in self._capture_restarts_in_progress.items()
+            if display_id is None or running_id == display_id
+        }
+        for pending_id, task in list(self._pending_capture_restarts.items()):
+            if display_id is not None and pending_id != display_id:
+                continue
+            if task not in tasks:
+                task.cancel()
+                del self._pending_capture_restarts[pending_id]
+            tasks.add(task)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _restart_capture_after_delay(self, display_id: str):
+        current_task = asyncio.current_task()
+        needs_reconfigure = False
+        try:
+            await asyncio.sleep(CAPTURE_RESTART_DEBOUNCE_S)
+            async with self._reconfigure_lock:
+                self._capture_restarts_in_progress[display_id] = current_task
+                display_state = self.display_clients.get(display_id)
+                if not display_state or not display_state.get('video_active', True):
+                    return
+                if hasattr(self, 'display_layouts') and display_id in self.display_layouts:
+                    layout = self.display_layouts[display_id]
+                    await self._stop_capture_for_display(display_id)
+                    await self._start_capture_for_display(
+                        display_id=display_id,
+                        width=layout['w'], height=layout['h'],
+                        x_offset=layout['x'], y_offset=layout['y']
+                    )
+                    await self._start_backpressure_task_if_needed(display_id)
+                else:
+                    data_logger.warning(
+                        f"Cannot restart capture for '{display_id}': no layout found. "
+                        "Triggering full reconfiguration as a fallback."
+                    )
+                    needs_reconfigure = True
+        except Exception as e:
+            data_logger.error(f"Failed to restart capture for '{display_id}': {e}", exc_info=True)
+            needs_reconfigure = True
+        finally:
+            if self._capture_restarts_in_progress.get(display_id) is current_task:
+                del self._capture_restarts_in_progress[display_id]
+            if self._pending_capture_restarts.get(display_id) is current_task:
+                del self._pending_capture_restarts[display_id]
+        if needs_reconfigure:
+            # reconfigure_displays takes the lock itself, so this runs after it is released.
+            await self.reconfigure_displays()
+
     async def reconfigure_displays(self):
         """
         Central logic to create a virtual desktop for ALL connected clients.
@@ -2625,10 +3189,16 @@ class DataStreamingServer:
         async with self._reconfigure_lock:
             self._is_reconfiguring = True
             data_logger.info("Starting display reconfiguration...")
+            # Reconfiguration restarts every capture with the current settings.
+            await self._cancel_pending_capture_restarts()
+            # Reconfiguration rewrites display state, so settings that match
+            # the last SETTINGS message still have to be applied again.
+            for display_state in self.display_clients.values():
+                display_state.pop('last_applied_settings', None)
             try:
                 current_display_count = len(self.display_clients)
                 if self._wm_swap_is_supported is None:
-                    if which("xfce4-session") or which("startplasma-x11"):
+                    if _which("xfce4-session") or _which("startplasma-x11"):
                         self._wm_swap_is_supported = True
                     else:
                         self._wm_swap_is_supported = False
@@ -2652,7 +3222,7 @@ class DataStreamingServer:
                     if stop_bp_tasks:
                         await asyncio.gather(*stop_bp_tasks, return_exceptions=True)
                     stop_capture_tasks = [
-                        self.capture_loop.run_in_executor(None, inst['module'].stop_capture)
+                        self.capture_loop.run_in_executor(self._capture_executor, inst['module'].stop_capture)
                         for inst in self.capture_instances.values() if inst.get('module')
                     ]
                     if stop_capture_tasks:
@@ -2794,12 +3364,7 @@ class DataStreamingServer:
                 data_chunk = chunk_info['data']
                 frame_id = chunk_info['frame_id']
                 if display_id == 'primary':
-                    secondary_websockets = {
-                        client_info.get('ws')
-                        for did, client_info in self.display_clients.items()
-                        if did != 'primary' and client_info.get('ws')
-                    }
-                    primary_viewers = self.clients - secondary_websockets
+                    primary_viewers = self._get_primary_viewers()
 
                     if not primary_viewers:
                         queue.task_done()
@@ -2809,10 +3374,8 @@ class DataStreamingServer:
                         for primary_client_info in self.display_clients.values():
                             if primary_client_info.get('ws') is client_ws:
                                 if primary_client_info.get('backpressure_enabled', True):
-                                    primary_client_info['sent_timestamps'][frame_id] = now
+                                    primary_client_info['sent_timestamps'].record(frame_id, now)
                                     primary_client_info['last_sent_frame_id'] = frame_id
-                                    if len(primary_client_info['sent_timestamps']) > SENT_FRAME_TIMESTAMP_HISTORY_SIZE:
-                                        primary_client_info['sent_timestamps'].popitem(last=False)
                                 break
                     try:
                         websockets.broadcast(primary_viewers, data_chunk)
@@ -2827,10 +3390,8 @@ class DataStreamingServer:
                         continue
                     websocket = client_info['ws']
                     now = time.monotonic()
-                    client_info['sent_timestamps'][frame_id] = now
+                    client_info['sent_timestamps'].record(frame_id, now)
                     client_info['last_sent_frame_id'] = frame_id
-                    if len(client_info['sent_timestamps']) > SENT_FRAME_TIMESTAMP_HISTORY_SIZE:
-                        client_info['sent_timestamps'].popitem(last=False)
                     try:
                         await websocket.send(data_chunk)
                         self._bytes_sent_in_interval += len(data_chunk)
@@ -2861,43 +3422,108 @@ class DataStreamingServer:
             settings = self._get_capture_settings(display_id, width, height, x_offset, y_offset)
             display_state = self.display_clients.get(display_id, {})
             encoder_for_this_capture = display_state.get('encoder', self.app.encoder)
+            queue_size = getattr(self, 'BACKPRESSURE_QUEUE_SIZE', 120)
+
+            # Stripes are handed from the capture thread through a bounded deque,
+            # and the loop is woken once per batch instead of once per stripe.
+            # When either the deque or the sender queue is full the newest
+            # stripe is dropped, and a keyframe is requested to repair the stream.
+            pending_chunks = deque()
+            drain_scheduled = False
+            # The capture callback only ever increments callback_drops (under
+            # callback_drops_lock, in case pixelflux calls back from more than
+            # one thread). The drain is the only writer of the other counters.
+            callback_drops = 0
+            callback_drops_lock = threading.Lock()
+            callback_drops_seen = 0
+            dropped_stripes = 0
+            last_drop_keyframe_time = 0.0
+            missing_idr_request_logged = False
+            # Primary stripes go to every viewer regardless of backpressure;
+            # other displays are paused entirely while backpressured.
+            drop_while_backpressured = display_id != 'primary'
+
+            def drain_pending_chunks():
+                nonlocal drain_scheduled, dropped_stripes, last_drop_keyframe_time
+                nonlocal missing_idr_request_logged, callback_drops_seen
+                drain_scheduled = False
+                total_callback_drops = callback_drops
+                dropped_stripes += total_callback_drops - callback_drops_seen
+                callback_drops_seen = total_callback_drops
+                queue = self.video_chunk_queues.get(display_id)
+                while pending_chunks:
+                    item_to_queue = pending_chunks.popleft()
+                    if queue:
+                        try:
+                            queue.put_nowait(item_to_queue)
+                        except asyncio.QueueFull:
+                            dropped_stripes += 1
+                if dropped_stripes:
+                    now = time.monotonic()
+                    if now - last_drop_keyframe_time >= STRIPE_DROP_KEYFRAME_INTERVAL_S:
+                        data_logger.warning(
+                            f"Dropped {dropped_stripes} video stripes for '{display_id}' "
+                            "while its sender was behind. Requesting a keyframe."
+                        )
+                        dropped_stripes = 0
+                        last_drop_keyframe_time = now
+                        capture_info = self.capture_instances.get(display_id)
+                        capture_module = capture_info.get('module') if capture_info else None
+                        # request_idr_frame only exists in newer pixelflux releases.
+                        request_idr_frame = getattr(capture_module, 'request_idr_frame', None)
+                        if request_idr_frame is not None:
+                            request_idr_frame()
+                        elif capture_module and not missing_idr_request_logged:
+                            missing_idr_request_logged = True
+                            data_logger.warning(
+                                "The installed pixelflux has no request_idr_frame(); "
+                                f"'{display_id}' will recover from dropped stripes at the next keyframe."
+                            )
 
             def queue_data_for_display(result_ptr, user_data):
                 """Callback from C++ capture library. Adds necessary header for JPEG."""
+                nonlocal drain_scheduled, callback_drops
                 if not result_ptr:
                     return
+                if drop_while_backpressured:
+                    # The sender would discard this stripe anyway, so skip the copy.
+                    client_info = self.display_clients.get(display_id)
+                    if client_info is not None and not client_info.get('backpressure_enabled', True):
+                        return
+                if len(pending_chunks) >= queue_size:
+                    # The loop has fallen behind; drop this stripe before copying it.
+                    with callback_drops_lock:
+                        callback_drops += 1
+                    return
                 try:
                     result = result_ptr.contents
                     if result.size > 0:
-                        data_bytes = bytes(result.data[:result.size])
                         if encoder_for_this_capture == "jpeg":
-                            final_data_to_queue = b"\x03\x00" + data_bytes
+                            # Copy the stripe once, straight in behind the JPEG header.
+                            final_data_to_queue = bytearray(JPEG_PACKET_HEADER_LEN + result.size)
+                            final_data_to_queue[:JPEG_PACKET_HEADER_LEN] = JPEG_PACKET_HEADER
+                            ctypes.memmove(
+                                (ctypes.c_char * result.size).from_buffer(final_data_to_queue, JPEG_PACKET_HEADER_LEN),
+                                result.data, result.size
+                            )
                         else:
-                            final_data_to_queue = data_bytes
-                        
-                        queue = self.video_chunk_queues.get(display_id)
-                        if queue:
-                            item_to_queue = {'data': final_data_to_queue, 'frame_id': result.frame_id}
-                            
-                            def do_put():
-                                try:
-                                    queue.put_nowait(item_to_queue)
-                                except asyncio.QueueFull:
-                                    pass
-                            
-                            self.capture_loop.call_soon_threadsafe(do_put)
+                            final_data_to_queue = ctypes.string_at(result.data, result.size)
+
+                        pending_chunks.append({'data': final_data_to_queue, 'frame_id': result.frame_id})
+                        if not drain_scheduled:
+                            drain_scheduled = True
+                            self.capture_loop.call_soon_threadsafe(drain_pending_chunks)
 
                 except Exception as e:
                     data_logger.error(f"Error in capture callback for {display_id}: {e}", exc_info=False)
 
-            queue_size = getattr(self, 'BACKPRESSURE_QUEUE_SIZE', 120)
             self.video_chunk_queues[display_id] = asyncio.Queue(maxsize=queue_size)
             sender_task = asyncio.create_task(self._video_chunk_sender(display_id))
             
             capture_module = ScreenCapture()
 
             await self.capture_loop.run_in_executor(
-                None,
+                self._capture_executor,
                 capture_module.start_capture,
                 settings,
                 StripeCallback(queue_data_for_display)
@@ -2922,15 +3548,16 @@ class DataStreamingServer:
         if not display_state:
             raise SelkiesAppError(f"Cannot get capture settings for unknown display_id '{display_id}'")
 
-        cs = CaptureSettings()
+        # Start from a byte copy of the session-constant fields, then fill in
+        # the per-display ones.
+        cs = CaptureSettings.from_buffer_copy(self._get_capture_settings_template())
         cs.capture_width = width
         cs.capture_height = height
         cs.capture_x = x
         cs.capture_y = y
         cs.target_fps = float(display_state.get('framerate', self.app.framerate))
         cs.capture_cursor = self.capture_cursor
-        cs.debug_logging = self.cli_args.debug[0]
-        
+
         encoder = display_state.get('encoder', self.app.encoder)
         if encoder == "jpeg":
             cs.output_mode = 0
@@ -2946,11 +3573,22 @@ class DataStreamingServer:
             cs.h264_fullframe = (encoder == "x264enc")
 
         cs.use_paint_over_quality = display_state.get('use_paint_over_quality', self._initial_use_paint_over_quality)
+        cs.use_cpu = display_state.get('use_cpu', self._initial_use_cpu)
+        return cs
+
+    def _get_capture_settings_template(self):
+        """
+        Builds, once per server, the CaptureSettings fields that do not depend
+        on the display or client settings.
+        """
+        if self._capture_settings_template is not None:
+            return self._capture_settings_template
+        cs = CaptureSettings()
+        cs.debug_logging = self.cli_args.debug[0]
         cs.paint_over_trigger_frames = 15
         cs.damage_block_threshold = 10
         cs.damage_block_duration = 20
-        cs.use_cpu = display_state.get('use_cpu', self._initial_use_cpu)
-        
+
         if self.cli_args.dri_node:
             cs.vaapi_render_node_index = parse_dri_node_to_index(self.cli_args.dri_node)
         else:
@@ -2958,9 +3596,15 @@ class DataStreamingServer:
 
         watermark_path_str = self.cli_args.watermark_path
         if watermark_path_str and os.path.exists(watermark_path_str):
-            cs.watermark_path = watermark_path_str.encode('utf-8')
-            cs.watermark_location_enum = self.cli_args.watermark_location
-        
+            # Copies made with from_buffer_copy only hold the raw pointer, so the
+            # encoded path is kept alive on self.
+            self._watermark_path_bytes = watermark_path_str.encode('utf-8')
+            cs.watermark_path = self._watermark_path_bytes
+            watermark_location = self.cli_args.watermark_location
+            # Out-of-range locations, including the -1 default, fall back to 4.
+            cs.watermark_location_enum = watermark_location if 0 <= watermark_location <= 6 else 4
+
+        self._capture_settings_template = cs
         return cs
 
 async def _collect_system_stats_ws(shared_data, interval_seconds=1):
@@ -2989,8 +3633,9 @@ async def _collect_gpu_stats_ws(shared_data, gpu_id=0, interval_seconds=1):
     data_logger.debug(
         f"GPU monitor loop (WS mode) for GPU {gpu_id}, interval: {interval_seconds}s"
     )
+    loop = asyncio.get_running_loop()
     try:
-        gpus = GPUtil.getGPUs()
+        gpus = await loop.run_in_executor(None, GPUtil.getGPUs)
         if not gpus:
             data_logger.warning("No GPUs detected for GPU monitor (WS).")
             return
@@ -3000,7 +3645,7 @@ async def _collect_gpu_stats_ws(shared_data, gpu_id=0, interval_seconds=1):
 
         while True:
             try:
-                gpus = GPUtil.getGPUs()
+                gpus = await loop.run_in_executor(None, GPUtil.getGPUs)
                 if not gpus or gpu_id >= len(gpus):
                     data_logger.error(f"GPU {gpu_id} no longer available.")
                     break
@@ -3056,22 +3701,28 @@ async def _collect_network_stats_ws(shared_data, server_instance, interval_secon
         data_logger.error(f"Network monitor (WS) error: {e}", exc_info=True)
 
 async def _send_stats_periodically_ws(websocket, shared_data, interval_seconds=5):
+    # The samplers are shared by all clients, so each sender reads the latest
+    # snapshots and skips any it has already sent.
+    last_sent = {}
     try:
         while True:
             await asyncio.sleep(interval_seconds)
-            system_stats = shared_data.pop("system", None)
-            gpu_stats = shared_data.pop("gpu", None)
-            network_stats = shared_data.pop("network", None)
+            snapshots = {key: shared_data.get(key) for key in ("system", "gpu", "network")}
+            system_stats, gpu_stats, network_stats = (
+                None if stats is last_sent.get(key) else stats
+                for key, stats in snapshots.items()
+            )
+            last_sent = snapshots
             try:
                 if not websocket:  # Check if websocket is still valid
                     data_logger.info("Stats sender: WS closed or invalid.")
                     break
                 if system_stats:
-                    await websocket.send(json.dumps(system_stats))
+                    await websocket.send(json_dumps(system_stats))
                 if gpu_stats:
-                    await websocket.send(json.dumps(gpu_stats))
+                    await websocket.send(json_dumps(gpu_stats))
                 if network_stats:
-                    await websocket.send(json.dumps(network_stats))
+                    await websocket.send(json_dumps(network_stats))
             except websockets.exceptions.ConnectionClosed:
                 data_logger.info("Stats sender: WS connection closed.")
                 break
@@ -3115,6 +3766,8 @@ async def on_resize_handler(res_str, current_app_instance, data_server_instance=
 
             client_info['width'] = target_w
             client_info['height'] = target_h
+            # The next SETTINGS message must be applied even if it matches the last one.
+            client_info.pop('last_applied_settings', None)
             
             if display_id == 'primary':
                 current_app_instance.display_width = target_w
@@ -3147,7 +3800,7 @@ async def main():
     if min_fr == max_fr:
         TARGET_FRAMERATE = min_fr
     else:
-        fr_def = next((s for s in SETTING_DEFINITIONS if s['name'] == 'framerate'), None)
+        fr_def = SETTING_DEFINITIONS_BY_NAME.get('framerate')
         TARGET_FRAMERATE = fr_def['meta']['default_value'] if fr_def else 60
 
     initial_encoder = settings.encoder
@@ -3296,7 +3949,16 @@ async def main():
 
 def ws_entrypoint():
     try:
-        asyncio.run(main())
+        if UVLOOP_AVAILABLE:
+            logger.info("uvloop found. Running the event loop on uvloop.")
+            if hasattr(uvloop, "run"):
+                uvloop.run(main())
+            else:
+                # uvloop < 0.18 (e.g. distro python3-uvloop) has no uvloop.run().
+                uvloop.install()
+                asyncio.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("Application stopped by KeyboardInterrupt.")
     except SystemExit as e:
@@ -107,6 +107,9 @@ SETTING_DEFINITIONS = [
     {'name': 'enable_player4', 'type': 'bool', 'default': True, 'help': 'Enable sharing link for gamepad player 4.'},
 ]
 
+# Name -> definition index, for O(1) lookups of a single setting.
+SETTING_DEFINITIONS_BY_NAME = {setting['name']: setting for setting in SETTING_DEFINITIONS}
+
 
 class AppSettings:
     """
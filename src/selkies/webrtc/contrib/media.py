@@ -155,9 +155,9 @@ def player_worker_decode(
                 container.seek(0)
                 continue
             if audio_track:
-                asyncio.run_coroutine_threadsafe(audio_track._queue.put(None), loop)
+                loop.call_soon_threadsafe(audio_track._queue.put_nowait, None)
             if video_track:
-                asyncio.run_coroutine_threadsafe(video_track._queue.put(None), loop)
+                loop.call_soon_threadsafe(video_track._queue.put_nowait, None)
             break
 
         # read up to 1 second ahead
@@ -174,7 +174,7 @@ def player_worker_decode(
                 audio_samples += frame.samples
 
                 frame_time = frame.time
-                asyncio.run_coroutine_threadsafe(audio_track._queue.put(frame), loop)
+                loop.call_soon_threadsafe(audio_track._queue.put_nowait, frame)
         elif isinstance(frame, VideoFrame) and video_track:
             if frame.pts is None:  # pragma: no cover
                 logger.warning(
@@ -188,7 +188,7 @@ def player_worker_decode(
             frame.pts -= video_first_pts
 
             frame_time = frame.time
-            asyncio.run_coroutine_threadsafe(video_track._queue.put(frame), loop)
+            loop.call_soon_threadsafe(video_track._queue.put_nowait, frame)
 
 
 def player_worker_demux(
@@ -218,9 +218,9 @@ def player_worker_demux(
                 container.seek(0)
                 continue
             if audio_track:
-                asyncio.run_coroutine_threadsafe(audio_track._queue.put(None), loop)
+                loop.call_soon_threadsafe(audio_track._queue.put_nowait, None)
             if video_track:
-                asyncio.run_coroutine_threadsafe(video_track._queue.put(None), loop)
+                loop.call_soon_threadsafe(video_track._queue.put_nowait, None)
             break
 
         # read up to 1 second ahead
@@ -251,7 +251,7 @@ def player_worker_demux(
             and packet.time_base is not None
         ):
             frame_time = int(packet.pts * packet.time_base)
-            asyncio.run_coroutine_threadsafe(track._queue.put(packet), loop)
+            loop.call_soon_threadsafe(track._queue.put_nowait, packet)
 
 
 class PlayerStreamTrack(MediaStreamTrack):
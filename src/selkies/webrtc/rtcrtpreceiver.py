@@ -93,7 +93,7 @@ def decoder_worker(
         task = input_q.get()
         if task is None:
             # inform the track that is has ended
-            asyncio.run_coroutine_threadsafe(output_q.put(None), loop)
+            loop.call_soon_threadsafe(output_q.put_nowait, None)
             break
         codec, encoded_frame = task
 
@@ -103,7 +103,7 @@ def decoder_worker(
 
         for frame in decoder.decode(encoded_frame):
             # pass the decoded frame to the track
-            asyncio.run_coroutine_threadsafe(output_q.put(frame), loop)
+            loop.call_soon_threadsafe(output_q.put_nowait, frame)
 
     if decoder is not None:
         del decoder